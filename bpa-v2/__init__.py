@@ -10,8 +10,8 @@ from bpa_v2.core.exceptions.exceptions import (
     ServiceUnavailableError
 )
 
-from bpa_v2.core.logging.logger_config import setup_logging
-from bpa_v2.utils.config_reader import load_config, get_module_config, BaseBPASettings
+from bpa_v2.core.logging.logger_config import setup_logging, stop_logging
+from bpa_v2.utils.config_reader import load_config, reload_config, get_module_config, BaseBPASettings
 from bpa_v2.core.database.base_model import Database, BaseModel, DatabaseConfig, init_db
 from bpa_v2.core.database.repositories import Repository
 from bpa_v2.core.auth.auth_service import AuthService, UserInfo
@@ -47,9 +47,11 @@ __all__ = [
     
     # Logger
     "setup_logging",
+    "stop_logging",
     
     # Config
     "load_config",
+    "reload_config",
     "get_module_config",
     "BaseBPASettings",
     
@@ -1,17 +1,49 @@
 from sqlalchemy import create_engine, MetaData, Column, Integer, DateTime, String, inspect
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, scoped_session
-from sqlalchemy.pool import QueuePool
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool, NullPool
 from datetime import datetime
 import logging
-from typing import Dict, Any, Optional, List
+import threading
+from contextlib import contextmanager
+from urllib.parse import quote
+from typing import Dict, Any, Optional, List, Tuple, FrozenSet
 
-from bpa_v2.core.exceptions.exceptions import DatabaseError
+from bpa_v2.core.exceptions.exceptions import DatabaseError, ConfigurationError
 
 logger = logging.getLogger(__name__)
 
+# Classes de pool aceitas em DatabaseConfig.poolclass
+POOL_CLASSES = {
+    "queue": QueuePool,
+    "null": NullPool,
+}
+
+# Drivers aceitos em DatabaseConfig.driver
+DRIVERS = ("psycopg", "psycopg2")
+
 class DatabaseConfig:
-    """Configuração de conexão com o banco de dados."""
+    """
+    Configuração de conexão com o banco de dados.
+    
+    Atrás do PgBouncer em modo transaction pooling use pool_pre_ping=False
+    (o SELECT 1 de verificação deixa backends presos em idle in transaction),
+    prepare_threshold=None (statements preparados no servidor falham com
+    "prepared statement ... does not exist/already exists" quando a conexão
+    muda de backend) e, de preferência, poolclass="null" ou
+    pool_size/max_overflow reduzidos, deixando o pooling a cargo do PgBouncer.
+    
+    driver="psycopg2" usa o driver legado (pacote psycopg2 instalado à parte);
+    as opções executemany_* só se aplicam a ele, e prepare_threshold só ao psycopg 3.
+    """
+    
+    __slots__ = (
+        "host", "port", "user", "password", "database", "schema",
+        "pool_size", "max_overflow", "pool_timeout", "pool_recycle",
+        "pool_pre_ping", "poolclass", "isolation_level", "query_cache_size",
+        "executemany_values_page_size", "executemany_batch_page_size",
+        "prepare_threshold", "driver", "echo"
+    )
     
     def __init__(
         self,
@@ -25,8 +57,25 @@ class DatabaseConfig:
         max_overflow: int = 10,
         pool_timeout: int = 30,
         pool_recycle: int = 3600,
+        pool_pre_ping: bool = True,
+        poolclass: str = "queue",
+        isolation_level: Optional[str] = None,
+        query_cache_size: int = 1200,
+        executemany_values_page_size: int = 1000,
+        executemany_batch_page_size: int = 500,
+        prepare_threshold: Optional[int] = 5,
+        driver: str = "psycopg",
         echo: bool = False
     ):
+        if poolclass not in POOL_CLASSES:
+            raise ConfigurationError(
+                f"poolclass inválido: {poolclass}. Use um dos seguintes: {', '.join(POOL_CLASSES)}"
+            )
+        if driver not in DRIVERS:
+            raise ConfigurationError(
+                f"driver inválido: {driver}. Use um dos seguintes: {', '.join(DRIVERS)}"
+            )
+        
         self.host = host
         self.port = port
         self.user = user
@@ -37,52 +86,122 @@ class DatabaseConfig:
         self.max_overflow = max_overflow
         self.pool_timeout = pool_timeout
         self.pool_recycle = pool_recycle
+        self.pool_pre_ping = pool_pre_ping
+        self.poolclass = poolclass
+        self.isolation_level = isolation_level
+        self.query_cache_size = query_cache_size
+        self.executemany_values_page_size = executemany_values_page_size
+        self.executemany_batch_page_size = executemany_batch_page_size
+        self.prepare_threshold = prepare_threshold
+        self.driver = driver
         self.echo = echo
         
     @property
     def connection_string(self) -> str:
-        """Retorna a string de conexão com o banco de dados."""
-        return f"postgresql://{self.user}:{self.password}@{self.host}:{self.port}/{self.database}"
+        """Retorna a string de conexão com o banco de dados para o driver configurado."""
+        # Usuário e senha escapados com quote (não quote_plus: o SQLAlchemy não converte '+' em espaço)
+        return (
+            f"postgresql+{self.driver}://{quote(self.user, safe='')}:{quote(self.password, safe='')}"
+            f"@{self.host}:{self.port}/{self.database}?application_name=bpa-v2"
+        )
 
 class Database:
     """Gerenciador de conexão com o banco de dados."""
     
     _instance = None
+    _lock = threading.Lock()
     
     def __new__(cls, config: Optional[DatabaseConfig] = None):
         if cls._instance is None:
-            cls._instance = super(Database, cls).__new__(cls)
-            cls._instance.initialized = False
+            with cls._lock:
+                if cls._instance is None:
+                    instance = super(Database, cls).__new__(cls)
+                    instance.initialized = False
+                    cls._instance = instance
         return cls._instance
     
     def __init__(self, config: Optional[DatabaseConfig] = None):
         if self.initialized:
+            if config is not None and config is not self.config:
+                logger.warning("Database já inicializado; a configuração fornecida foi ignorada")
             return
+        
+        with self._lock:
+            # Outro thread pode ter concluído a inicialização enquanto aguardávamos o lock
+            if self.initialized:
+                return
             
-        if config is None:
-            raise ValueError("É necessário fornecer uma configuração de banco de dados")
+            if config is None:
+                raise ValueError("É necessário fornecer uma configuração de banco de dados")
             
+            self._initialize(config)
+    
+    def _initialize(self, config: DatabaseConfig):
+        """Cria engine, fábrica de sessões e base declarativa. Executado uma única vez."""
         self.config = config
         self.metadata = MetaData(schema=config.schema)
-        self.engine = create_engine(
-            config.connection_string,
-            pool_size=config.pool_size,
-            max_overflow=config.max_overflow,
-            pool_timeout=config.pool_timeout,
-            pool_recycle=config.pool_recycle,
-            echo=config.echo,
-            poolclass=QueuePool
-        )
+        engine_options = {
+            "pool_pre_ping": config.pool_pre_ping,
+            "query_cache_size": config.query_cache_size,
+            "use_insertmanyvalues": True,
+            "echo": config.echo,
+            "poolclass": POOL_CLASSES[config.poolclass],
+            "future": True,
+        }
+        if config.poolclass == "queue":
+            # NullPool não aceita parâmetros de dimensionamento do pool
+            engine_options.update(
+                pool_size=config.pool_size,
+                max_overflow=config.max_overflow,
+                pool_timeout=config.pool_timeout,
+                pool_recycle=config.pool_recycle,
+            )
+        if config.isolation_level:
+            engine_options["isolation_level"] = config.isolation_level
+        if config.driver == "psycopg2":
+            # Agrupa executemany em INSERTs multi-VALUES e lotes de UPDATE/DELETE
+            engine_options.update(
+                executemany_mode="values_plus_batch",
+                # No SQLAlchemy 2.x o tamanho das páginas do multi-VALUES é o do insertmanyvalues
+                insertmanyvalues_page_size=config.executemany_values_page_size,
+                executemany_batch_page_size=config.executemany_batch_page_size,
+            )
+        elif config.driver == "psycopg" and config.prepare_threshold is not None:
+            # psycopg 3 prepara no servidor os statements executados mais de N vezes
+            engine_options["connect_args"] = {"prepare_threshold": config.prepare_threshold}
+        
+        self.engine = create_engine(config.connection_string, **engine_options)
         self.session_factory = sessionmaker(bind=self.engine)
-        self.Session = scoped_session(self.session_factory)
+        self.Session = self.session_factory
         self.Base = declarative_base(metadata=self.metadata)
         self.initialized = True
         
-        logger.info(f"Conexão com banco de dados inicializada: {config.host}:{config.port}/{config.database}")
+        logger.info("Conexão com banco de dados inicializada: %s:%s/%s", config.host, config.port, config.database)
     
     def create_session(self):
         """Cria uma nova sessão de banco de dados."""
         return self.Session()
+    
+    @contextmanager
+    def session_scope(self):
+        """
+        Fornece uma sessão com ciclo de vida explícito.
+        
+        Confirma a transação ao final do bloco, reverte em caso de erro e
+        sempre fecha a sessão.
+        
+        Yields:
+            Session: Sessão de banco de dados
+        """
+        session = self.Session()
+        try:
+            yield session
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
         
     def create_all(self):
         """Cria todas as tabelas definidas nos modelos."""
@@ -111,14 +230,37 @@ class BaseModel:
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     
+    @classmethod
+    def _column_names(cls) -> Tuple[str, ...]:
+        """Retorna os nomes das colunas da tabela, calculados uma única vez por classe."""
+        names = cls.__dict__.get("_cached_column_names")
+        if names is None:
+            names = tuple(c.name for c in cls.__table__.columns)
+            cls._cached_column_names = names
+            cls._cached_column_set = frozenset(names)
+        return names
+    
+    @classmethod
+    def _column_set(cls) -> FrozenSet[str]:
+        """Retorna o conjunto de nomes de colunas para testes de pertinência."""
+        if "_cached_column_set" not in cls.__dict__:
+            cls._column_names()
+        return cls._cached_column_set
+    
     def to_dict(self) -> Dict[str, Any]:
         """Converte o modelo para um dicionário."""
-        return {c.name: getattr(self, c.name) for c in self.__table__.columns}
+        # Lê direto do __dict__ e só recorre ao getattr para atributos não carregados
+        values = self.__dict__
+        return {
+            name: values[name] if name in values else getattr(self, name)
+            for name in self._column_names()
+        }
         
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> Any:
         """Cria uma instância do modelo a partir de um dicionário."""
-        return cls(**{k: v for k, v in data.items() if k in cls.__table__.columns.keys()})
+        columns = cls._column_set()
+        return cls(**{k: v for k, v in data.items() if k in columns})
 
 # Função para inicializar o banco de dados
 def init_db(config: DatabaseConfig) -> Database:
@@ -134,5 +276,5 @@ def init_db(config: DatabaseConfig) -> Database:
     try:
         return Database(config)
     except Exception as e:
-        logger.error(f"Erro ao inicializar banco de dados: {str(e)}")
+        logger.error("Erro ao inicializar banco de dados: %s", e)
         raise DatabaseError(f"Falha na conexão com o banco de dados: {str(e)}") 
\ No newline at end of file
@@ -1,52 +1,337 @@
-from typing import List, Dict, Any, Optional, TypeVar, Generic, Type, Union, Tuple
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc, asc, func
+from typing import List, Dict, Any, Optional, TypeVar, Generic, Type, Union, Tuple, Sequence, Iterator
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy.orm.util import identity_key
+from sqlalchemy.orm.interfaces import LoaderOption
+from sqlalchemy.orm.attributes import InstrumentedAttribute
+from sqlalchemy import and_, or_, desc, asc, func, insert, update, select, literal_column, inspect, bindparam, event
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+import copy
+import itertools
 import logging
+import threading
+from collections import OrderedDict
 from datetime import datetime
+from functools import lru_cache
 
 from bpa_v2.core.exceptions.exceptions import DatabaseError
 from bpa_v2.core.database.base_model import BaseModel
 
 T = TypeVar('T')
 logger = logging.getLogger(__name__)
+_error = logger.error
+
+@lru_cache(maxsize=None)
+def _has_server_defaults(model_class: type) -> bool:
+    """Indica se alguma coluna do modelo tem valor gerado pelo servidor."""
+    return any(
+        column.server_default is not None or column.server_onupdate is not None
+        for column in model_class.__table__.columns
+    )
+
+# Selects parametrizados por formato de filtros, reaproveitados entre chamadas
+_STATEMENT_CACHE_SIZE = 512
+_statement_cache: Dict[Tuple, Any] = {}
+
+def _cache_statement(key: Tuple, stmt: Any):
+    """Guarda um statement no cache, descartando-o por inteiro ao atingir o limite."""
+    if len(_statement_cache) >= _STATEMENT_CACHE_SIZE:
+        _statement_cache.clear()
+    _statement_cache[key] = stmt
+
+@lru_cache(maxsize=None)
+def _column_map(model_class: type) -> Dict[str, InstrumentedAttribute]:
+    """Mapeia, uma única vez por modelo, o nome de cada coluna para seu atributo instrumentado."""
+    return {attr.key: attr.class_attribute for attr in inspect(model_class).column_attrs}
+
+class _EntityCache:
+    """
+    Cache LRU de entidades por ID, compartilhado entre sessões.
+    Armazena apenas os valores das colunas, nunca instâncias ligadas a uma sessão.
+    """
+    
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Any, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, entity_id: Any) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            values = self._data.get(entity_id)
+            if values is not None:
+                self._data.move_to_end(entity_id)
+            return values
+    
+    def put(self, entity_id: Any, values: Dict[str, Any]):
+        with self._lock:
+            self._data[entity_id] = values
+            self._data.move_to_end(entity_id)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def invalidate(self, entity_ids: Optional[Sequence[Any]] = None):
+        with self._lock:
+            if entity_ids is None:
+                self._data.clear()
+            else:
+                for entity_id in entity_ids:
+                    self._data.pop(entity_id, None)
+
+# Caches de entidades por modelo, compartilhados entre instâncias de Repository
+_entity_caches: Dict[type, _EntityCache] = {}
+_entity_caches_lock = threading.Lock()
+
+def _get_entity_cache(model_class: type, maxsize: int) -> _EntityCache:
+    """Retorna o cache do modelo, criando-o no primeiro uso."""
+    with _entity_caches_lock:
+        cache = _entity_caches.get(model_class)
+        if cache is None:
+            cache = _entity_caches[model_class] = _EntityCache(maxsize)
+        return cache
+
+# Limite de parâmetros por statement do protocolo do PostgreSQL
+_PG_MAX_BIND_PARAMS = 65535
+
+# Chave em Session.info com as invalidações pendentes até o fim da transação
+_PENDING_INVALIDATIONS = "_entity_cache_pending"
+
+def _apply_pending_invalidations(session: Session, *args):
+    """
+    Aplica as invalidações registradas na sessão ao fim da transação.
+    
+    Após o commit, descarta valores que outra sessão tenha guardado no cache
+    entre a invalidação imediata e a confirmação; após o rollback, descarta
+    valores ainda não confirmados lidos pela própria sessão.
+    """
+    pending = session.info.pop(_PENDING_INVALIDATIONS, None)
+    if not pending:
+        return
+    for model_class, entity_ids in pending.items():
+        cache = _entity_caches.get(model_class)
+        if cache is not None:
+            cache.invalidate(None if entity_ids is None else list(entity_ids))
+
+def _schedule_invalidation(session: Session, model_class: type, entity_ids: Optional[Sequence[Any]]):
+    """Registra uma invalidação a ser repetida no commit ou rollback da sessão."""
+    pending = session.info.get(_PENDING_INVALIDATIONS)
+    if pending is None:
+        pending = session.info[_PENDING_INVALIDATIONS] = {}
+        if not event.contains(session, "after_commit", _apply_pending_invalidations):
+            event.listen(session, "after_commit", _apply_pending_invalidations)
+            event.listen(session, "after_rollback", _apply_pending_invalidations)
+    
+    if entity_ids is None:
+        pending[model_class] = None
+    elif model_class not in pending:
+        pending[model_class] = set(entity_ids)
+    elif pending[model_class] is not None:
+        pending[model_class].update(entity_ids)
+
+def _invalidate_and_schedule(session: Session, model_class: type, entity_ids: Optional[Sequence[Any]]):
+    """Invalida o cache do modelo, se houver, e repete a invalidação ao fim da transação."""
+    cache = _entity_caches.get(model_class)
+    if cache is None:
+        return
+    cache.invalidate(entity_ids)
+    _schedule_invalidation(session, model_class, entity_ids)
+
+# Opção de execução dos statements que já invalidam o cache por conta própria
+_SKIP_CACHE_INVALIDATION = "skip_entity_cache_invalidation"
+
+@event.listens_for(Session, "after_flush")
+def _invalidate_flushed(session: Session, flush_context: Any):
+    """
+    Invalida as entidades alteradas ou removidas por um flush do ORM.
+    
+    Cobre o uso direto da sessão (get_by_id, alteração de atributos e commit),
+    que não passa pelos métodos de escrita do Repository.
+    """
+    if not _entity_caches:
+        return
+    for entity in itertools.chain(session.dirty, session.deleted):
+        model_class = type(entity)
+        if model_class not in _entity_caches:
+            continue
+        identity = inspect(entity).identity
+        if identity is not None:
+            _invalidate_and_schedule(session, model_class, [identity[0] if len(identity) == 1 else identity])
+
+@event.listens_for(Session, "do_orm_execute")
+def _invalidate_bulk_statements(orm_execute_state: Any):
+    """
+    Invalida o cache em UPDATE/DELETE do ORM executados pela sessão.
+    
+    No UPDATE em lote por chave primária (session.execute(update(M), linhas))
+    são invalidados apenas os IDs das linhas; nos demais o cache do modelo é limpo.
+    Session.bulk_update_mappings não emite eventos e não é coberto.
+    """
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is None or mapper.class_ not in _entity_caches:
+        return
+    if orm_execute_state.execution_options.get(_SKIP_CACHE_INVALIDATION):
+        return
+    
+    entity_ids = None
+    params = orm_execute_state.parameters
+    if isinstance(params, list) and len(mapper.primary_key) == 1:
+        key = mapper.get_property_by_column(mapper.primary_key[0]).key
+        if all(key in row for row in params):
+            entity_ids = [row[key] for row in params]
+    _invalidate_and_schedule(orm_execute_state.session, mapper.class_, entity_ids)
 
 class Repository(Generic[T]):
     """
     Implementação genérica do padrão Repository.
     Fornece métodos comuns para operações CRUD.
+    
+    Com cache=True, get_by_id passa a consultar um cache LRU em memória,
+    compartilhado por todos os repositórios do mesmo modelo e invalidado por
+    update, delete, delete_many e upsert, pelos flushes do ORM e por
+    UPDATE/DELETE executados pela sessão. Indicado para tabelas de referência
+    (TipoDocumento, Configuracao), lidas com frequência e raramente alteradas.
     """
     
-    def __init__(self, model_class: Type[T], session: Session):
+    def __init__(self, 
+                 model_class: Type[T], 
+                 session: Session, 
+                 cache: bool = False, 
+                 cache_size: int = 1024):
         self.model_class = model_class
         self.session = session
+        self._columns = _column_map(model_class)
+        self._cache = _get_entity_cache(model_class, cache_size) if cache else None
+    
+    def invalidate(self, entity_ids: Optional[Sequence[Any]] = None):
+        """
+        Remove entidades do cache de get_by_id.
+        
+        O cache é compartilhado por modelo, então a invalidação ocorre mesmo em
+        repositórios criados sem cache=True. Ela é aplicada imediatamente e
+        repetida ao fim da transação da sessão.
+        
+        Args:
+            entity_ids: IDs a invalidar (None limpa o cache do modelo)
+        """
+        _invalidate_and_schedule(self.session, self.model_class, entity_ids)
+    
+    def _get_cached(self, entity_id: Any) -> Optional[T]:
+        """Resolve get_by_id pelo cache, carregando do banco em caso de falta."""
+        existing = self.session.identity_map.get(identity_key(self.model_class, entity_id))
+        if existing is not None:
+            return existing
+        
+        values = self._cache.get(entity_id)
+        if values is None:
+            entity = self.session.get(self.model_class, entity_id)
+            if entity is not None:
+                self._cache.put(entity_id, {key: getattr(entity, key) for key in self._columns})
+            return entity
+        
+        # Reconstrói a entidade como persistente na sessão atual, sem emitir SELECT
+        entity = self.model_class(**copy.deepcopy(values))
+        make_transient_to_detached(entity)
+        self.session.add(entity)
+        return entity
+    
+    def _column(self, key: str) -> Any:
+        """Retorna o atributo mapeado de uma coluna, usando o mapa pré-calculado."""
+        column = self._columns.get(key)
+        if column is None:
+            # Atributos que não são colunas (relacionamentos, hybrids) seguem pelo getattr
+            return getattr(self.model_class, key)
+        return column
+    
+    def _build_conditions(self, filters: Dict[str, Any]) -> List[Any]:
+        """Converte um dicionário de filtros (campo=valor) em condições SQL; listas e tuplas geram IN."""
+        conditions = []
+        for key, value in filters.items():
+            column = self._column(key)
+            if value.__class__ is list or value.__class__ is tuple:
+                conditions.append(column.in_(value))
+            else:
+                conditions.append(column == value)
+        return conditions
+    
+    def _filter_shape(self, filters: Dict[str, Any]) -> Optional[Tuple[Tuple[str, str], ...]]:
+        """
+        Descreve o formato de um dicionário de filtros: campos e tipo de cada valor
+        (lista, nulo ou escalar). Retorna None se algum campo não for coluna.
+        """
+        shape = []
+        for key in sorted(filters):
+            if key not in self._columns:
+                return None
+            value = filters[key]
+            if value is None:
+                kind = "null"
+            elif value.__class__ is list or value.__class__ is tuple:
+                kind = "list"
+            else:
+                kind = "scalar"
+            shape.append((key, kind))
+        return tuple(shape)
     
-    def get_by_id(self, entity_id: int) -> Optional[T]:
+    def _bound_conditions(self, shape: Tuple[Tuple[str, str], ...]) -> List[Any]:
+        """Gera condições com bindparam para um formato de filtros."""
+        conditions = []
+        for key, kind in shape:
+            column = self._columns[key]
+            if kind == "null":
+                conditions.append(column.is_(None))
+            elif kind == "list":
+                conditions.append(column.in_(bindparam(f"f_{key}", expanding=True)))
+            else:
+                conditions.append(column == bindparam(f"f_{key}"))
+        return conditions
+    
+    @staticmethod
+    def _filter_params(filters: Dict[str, Any]) -> Dict[str, Any]:
+        """Valores dos filtros nomeados como os bindparams de _bound_conditions."""
+        return {f"f_{key}": value for key, value in filters.items() if value is not None}
+    
+    def get_by_id(self, 
+                  entity_id: int, 
+                  load_options: Optional[Sequence[LoaderOption]] = None) -> Optional[T]:
         """
         Busca uma entidade pelo ID.
         
         Args:
             entity_id: ID da entidade
+            load_options: Opções de carregamento de relacionamentos
+                (ex: [selectinload(Documento.historico)])
             
         Returns:
             Optional[T]: Entidade encontrada ou None
         """
         try:
-            return self.session.query(self.model_class).filter_by(id=entity_id).first()
+            if load_options:
+                return self.session.get(self.model_class, entity_id, options=load_options)
+            if self._cache is not None:
+                return self._get_cached(entity_id)
+            return self.session.get(self.model_class, entity_id)
         except Exception as e:
-            logger.error(f"Erro ao buscar {self.model_class.__name__} por ID {entity_id}: {str(e)}")
+            _error("Erro ao buscar %s por ID %s: %s", self.model_class.__name__, entity_id, e)
             raise DatabaseError(f"Falha ao buscar {self.model_class.__name__}: {str(e)}")
     
-    def get_all(self) -> List[T]:
+    def get_all(self, load_options: Optional[Sequence[LoaderOption]] = None) -> List[T]:
         """
         Retorna todas as entidades.
         
+        Args:
+            load_options: Opções de carregamento de relacionamentos
+                (ex: [selectinload(Documento.historico)])
+        
         Returns:
             List[T]: Lista de entidades
         """
         try:
-            return self.session.query(self.model_class).all()
+            query = self.session.query(self.model_class)
+            if load_options:
+                query = query.options(*load_options)
+            return query.all()
         except Exception as e:
-            logger.error(f"Erro ao buscar todas as entidades {self.model_class.__name__}: {str(e)}")
+            _error("Erro ao buscar todas as entidades %s: %s", self.model_class.__name__, e)
             raise DatabaseError(f"Falha ao listar {self.model_class.__name__}: {str(e)}")
     
     def get_by_filters(self, 
@@ -54,37 +339,63 @@ class Repository(Generic[T]):
                      order_by: Optional[str] = None,
                      limit: Optional[int] = None,
                      offset: Optional[int] = None,
-                     descending: bool = False) -> List[T]:
+                     descending: bool = False,
+                     load_options: Optional[Sequence[LoaderOption]] = None) -> List[T]:
         """
         Busca entidades com filtros.
         
+        Relacionamentos acessados nas entidades retornadas devem ser carregados
+        via load_options para evitar N+1 consultas, por exemplo
+        [selectinload(Documento.historico), joinedload(Documento.tipo_documento)].
+        
         Args:
-            filters: Dicionário de filtros (campo=valor)
+            filters: Dicionário de filtros (campo=valor; listas ou tuplas geram IN)
             order_by: Campo para ordenação
             limit: Limite de resultados
             offset: Deslocamento para paginação
             descending: Se a ordenação deve ser decrescente
+            load_options: Opções de carregamento de relacionamentos
             
         Returns:
             List[T]: Lista de entidades que correspondem aos filtros
         """
         try:
+            shape = self._filter_shape(filters) if not load_options else None
+            if shape is not None:
+                # Mesmo formato de filtros reaproveita o mesmo Select; só os valores mudam
+                key = ("select", self.model_class, shape, order_by, descending, bool(limit), bool(offset))
+                stmt = _statement_cache.get(key)
+                if stmt is None:
+                    stmt = select(self.model_class).where(*self._bound_conditions(shape))
+                    if order_by:
+                        order_func = desc if descending else asc
+                        stmt = stmt.order_by(order_func(self._column(order_by)))
+                    if limit:
+                        stmt = stmt.limit(bindparam("_limit"))
+                    if offset:
+                        stmt = stmt.offset(bindparam("_offset"))
+                    _cache_statement(key, stmt)
+                
+                params = self._filter_params(filters)
+                if limit:
+                    params["_limit"] = limit
+                if offset:
+                    params["_offset"] = offset
+                return self.session.scalars(stmt, params).all()
+            
             query = self.session.query(self.model_class)
             
+            if load_options:
+                query = query.options(*load_options)
+            
             # Aplicar filtros
             if filters:
-                conditions = []
-                for key, value in filters.items():
-                    if isinstance(value, list):
-                        conditions.append(getattr(self.model_class, key).in_(value))
-                    else:
-                        conditions.append(getattr(self.model_class, key) == value)
-                query = query.filter(and_(*conditions))
+                query = query.filter(and_(*self._build_conditions(filters)))
             
             # Aplicar ordenação
             if order_by:
                 order_func = desc if descending else asc
-                query = query.order_by(order_func(getattr(self.model_class, order_by)))
+                query = query.order_by(order_func(self._column(order_by)))
             
             # Aplicar limite e deslocamento
             if limit:
@@ -94,42 +405,85 @@ class Repository(Generic[T]):
             
             return query.all()
         except Exception as e:
-            logger.error(f"Erro ao buscar {self.model_class.__name__} com filtros: {str(e)}")
+            _error("Erro ao buscar %s com filtros: %s", self.model_class.__name__, e)
             raise DatabaseError(f"Falha ao filtrar {self.model_class.__name__}: {str(e)}")
     
+    def stream_by_filters(self, 
+                          filters: Optional[Dict[str, Any]] = None, 
+                          order_by: Optional[str] = None,
+                          descending: bool = False,
+                          batch_size: int = 1000) -> Iterator[T]:
+        """
+        Itera sobre as entidades que correspondem aos filtros, carregando-as em lotes.
+        
+        Indicado para leituras volumosas (relatórios, exportações): usa
+        yield_per, de modo que apenas `batch_size` entidades ficam em memória
+        por vez, em vez do resultado completo como em get_by_filters.
+        
+        Args:
+            filters: Dicionário de filtros (campo=valor; listas ou tuplas geram IN)
+            order_by: Campo para ordenação
+            descending: Se a ordenação deve ser decrescente
+            batch_size: Número de linhas buscadas do banco por lote
+            
+        Yields:
+            T: Entidades encontradas
+        """
+        try:
+            stmt = select(self.model_class)
+            if filters:
+                stmt = stmt.where(*self._build_conditions(filters))
+            if order_by:
+                order_func = desc if descending else asc
+                stmt = stmt.order_by(order_func(self._column(order_by)))
+            
+            stmt = stmt.execution_options(yield_per=batch_size)
+            for entity in self.session.scalars(stmt):
+                yield entity
+        except Exception as e:
+            _error("Erro ao iterar %s com filtros: %s", self.model_class.__name__, e)
+            raise DatabaseError(f"Falha ao iterar {self.model_class.__name__}: {str(e)}")
+    
     def count(self, filters: Optional[Dict[str, Any]] = None) -> int:
         """
         Conta o número de entidades que correspondem aos filtros.
         
         Args:
-            filters: Dicionário de filtros (campo=valor)
+            filters: Dicionário de filtros (campo=valor; listas ou tuplas geram IN)
             
         Returns:
             int: Número de entidades
         """
         try:
+            shape = self._filter_shape(filters or {})
+            if shape is not None:
+                key = ("count", self.model_class, shape)
+                stmt = _statement_cache.get(key)
+                if stmt is None:
+                    stmt = select(func.count(self.model_class.id)).where(*self._bound_conditions(shape))
+                    _cache_statement(key, stmt)
+                return self.session.scalar(stmt, self._filter_params(filters or {}))
+            
             query = self.session.query(func.count(self.model_class.id))
             
             if filters:
-                conditions = []
-                for key, value in filters.items():
-                    if isinstance(value, list):
-                        conditions.append(getattr(self.model_class, key).in_(value))
-                    else:
-                        conditions.append(getattr(self.model_class, key) == value)
-                query = query.filter(and_(*conditions))
+                query = query.filter(and_(*self._build_conditions(filters)))
             
             return query.scalar()
         except Exception as e:
-            logger.error(f"Erro ao contar {self.model_class.__name__}: {str(e)}")
+            _error("Erro ao contar %s: %s", self.model_class.__name__, e)
             raise DatabaseError(f"Falha ao contar {self.model_class.__name__}: {str(e)}")
     
-    def create(self, data: Union[Dict[str, Any], T]) -> T:
+    def create(self, data: Union[Dict[str, Any], T], refresh: bool = True) -> T:
         """
         Cria uma nova entidade.
         
+        O refresh após o flush só é feito quando o modelo possui defaults
+        gerados pelo servidor; os demais valores já estão na instância.
+        
         Args:
             data: Dicionário com dados ou instância da entidade
+            refresh: Se deve recarregar defaults do servidor (False nunca recarrega)
             
         Returns:
             T: Entidade criada
@@ -142,38 +496,44 @@ class Repository(Generic[T]):
             
             self.session.add(entity)
             self.session.flush()
-            self.session.refresh(entity)
+            if refresh and _has_server_defaults(self.model_class):
+                self.session.refresh(entity)
             return entity
         except Exception as e:
             self.session.rollback()
-            logger.error(f"Erro ao criar {self.model_class.__name__}: {str(e)}")
+            _error("Erro ao criar %s: %s", self.model_class.__name__, e)
             raise DatabaseError(f"Falha ao criar {self.model_class.__name__}: {str(e)}")
     
     def bulk_create(self, items: List[Dict[str, Any]]) -> List[T]:
         """
         Cria múltiplas entidades em lote.
         
+        Quando o dialeto suporta RETURNING em executemany, todas as linhas são
+        inseridas em um único INSERT ... RETURNING, que já devolve IDs e defaults.
+        
         Args:
             items: Lista de dicionários com dados das entidades
             
         Returns:
             List[T]: Lista de entidades criadas
         """
-        entities = []
+        if not items:
+            return []
+        
         try:
-            for item in items:
-                entity = self.model_class(**item)
-                self.session.add(entity)
-                entities.append(entity)
+            dialect = self.session.get_bind().dialect
+            if getattr(dialect, "insert_executemany_returning", False):
+                stmt = insert(self.model_class).returning(self.model_class, sort_by_parameter_order=True)
+                return list(self.session.scalars(stmt, items).all())
             
+            # Fallback para dialetos sem RETURNING: o flush já preenche as chaves primárias
+            entities = [self.model_class(**item) for item in items]
+            self.session.add_all(entities)
             self.session.flush()
-            for entity in entities:
-                self.session.refresh(entity)
-            
             return entities
         except Exception as e:
             self.session.rollback()
-            logger.error(f"Erro ao criar em lote {self.model_class.__name__}: {str(e)}")
+            _error("Erro ao criar em lote %s: %s", self.model_class.__name__, e)
             raise DatabaseError(f"Falha ao criar em lote {self.model_class.__name__}: {str(e)}")
     
     def update(self, entity_id: int, data: Dict[str, Any]) -> Optional[T]:
@@ -188,7 +548,7 @@ class Repository(Generic[T]):
             Optional[T]: Entidade atualizada ou None se não encontrada
         """
         try:
-            entity = self.get_by_id(entity_id)
+            entity = self.session.get(self.model_class, entity_id)
             if not entity:
                 return None
             
@@ -203,10 +563,48 @@ class Repository(Generic[T]):
             
             self.session.flush()
             self.session.refresh(entity)
+            self.invalidate([entity_id])
             return entity
         except Exception as e:
             self.session.rollback()
-            logger.error(f"Erro ao atualizar {self.model_class.__name__} ID {entity_id}: {str(e)}")
+            _error("Erro ao atualizar %s ID %s: %s", self.model_class.__name__, entity_id, e)
+            raise DatabaseError(f"Falha ao atualizar {self.model_class.__name__}: {str(e)}")
+    
+    def update_fast(self, entity_id: int, data: Dict[str, Any]) -> Optional[T]:
+        """
+        Atualiza uma entidade com um único UPDATE ... WHERE id = ? RETURNING.
+        
+        Diferente de update(), não carrega a entidade antes nem faz refresh
+        depois. Campos que não são colunas do modelo são ignorados; entidades
+        já presentes na sessão são sincronizadas com os valores retornados.
+        
+        Args:
+            entity_id: ID da entidade
+            data: Dicionário com dados a atualizar
+            
+        Returns:
+            Optional[T]: Entidade atualizada ou None se não encontrada
+        """
+        try:
+            values = {key: value for key, value in data.items() if key in self._columns}
+            if issubclass(self.model_class, BaseModel):
+                values["updated_at"] = datetime.utcnow()
+            if not values:
+                return self.get_by_id(entity_id)
+            
+            stmt = (
+                update(self.model_class)
+                .where(self.model_class.id == entity_id)
+                .values(**values)
+                .returning(self.model_class)
+                .execution_options(synchronize_session="fetch", **{_SKIP_CACHE_INVALIDATION: True})
+            )
+            entity = self.session.scalars(stmt).first()
+            self.invalidate([entity_id])
+            return entity
+        except Exception as e:
+            self.session.rollback()
+            _error("Erro ao atualizar %s ID %s: %s", self.model_class.__name__, entity_id, e)
             raise DatabaseError(f"Falha ao atualizar {self.model_class.__name__}: {str(e)}")
     
     def delete(self, entity_id: int) -> bool:
@@ -220,16 +618,17 @@ class Repository(Generic[T]):
             bool: True se removida com sucesso, False se não encontrada
         """
         try:
-            entity = self.get_by_id(entity_id)
+            entity = self.session.get(self.model_class, entity_id)
             if not entity:
                 return False
             
             self.session.delete(entity)
             self.session.flush()
+            self.invalidate([entity_id])
             return True
         except Exception as e:
             self.session.rollback()
-            logger.error(f"Erro ao remover {self.model_class.__name__} ID {entity_id}: {str(e)}")
+            _error("Erro ao remover %s ID %s: %s", self.model_class.__name__, entity_id, e)
             raise DatabaseError(f"Falha ao remover {self.model_class.__name__}: {str(e)}")
     
     def delete_many(self, filter_dict: Dict[str, Any]) -> int:
@@ -237,27 +636,22 @@ class Repository(Generic[T]):
         Remove múltiplas entidades com base em filtros.
         
         Args:
-            filter_dict: Dicionário de filtros (campo=valor)
+            filter_dict: Dicionário de filtros (campo=valor; listas ou tuplas geram IN)
             
         Returns:
             int: Número de entidades removidas
         """
         try:
-            conditions = []
-            for key, value in filter_dict.items():
-                if isinstance(value, list):
-                    conditions.append(getattr(self.model_class, key).in_(value))
-                else:
-                    conditions.append(getattr(self.model_class, key) == value)
-            
+            conditions = self._build_conditions(filter_dict)
             query = self.session.query(self.model_class).filter(and_(*conditions))
-            count = query.count()
-            query.delete(synchronize_session=False)
+            deleted = query.delete(synchronize_session=False)
             self.session.flush()
-            return count
+            # As linhas removidas não são conhecidas sem consultá-las; limpa o cache do modelo
+            self.invalidate()
+            return deleted
         except Exception as e:
             self.session.rollback()
-            logger.error(f"Erro ao remover múltiplos {self.model_class.__name__}: {str(e)}")
+            _error("Erro ao remover múltiplos %s: %s", self.model_class.__name__, e)
             raise DatabaseError(f"Falha ao remover múltiplos {self.model_class.__name__}: {str(e)}")
     
     def upsert(self, 
@@ -293,6 +687,7 @@ class Repository(Generic[T]):
                 
                 self.session.flush()
                 self.session.refresh(entity)
+                self.invalidate([entity.id])
                 return entity, False
             else:
                 # Cria se não existir
@@ -300,7 +695,7 @@ class Repository(Generic[T]):
                 return entity, True
         except Exception as e:
             self.session.rollback()
-            logger.error(f"Erro ao upsert {self.model_class.__name__}: {str(e)}")
+            _error("Erro ao upsert %s: %s", self.model_class.__name__, e)
             raise DatabaseError(f"Falha ao upsert {self.model_class.__name__}: {str(e)}")
     
     def bulk_upsert(self, 
@@ -309,6 +704,14 @@ class Repository(Generic[T]):
         """
         Insere ou atualiza múltiplas entidades com base em campos únicos.
         
+        No PostgreSQL o lote é resolvido com INSERT ... ON CONFLICT DO UPDATE;
+        os campos únicos precisam estar cobertos por uma constraint ou índice
+        único. Itens repetidos no lote são consolidados, prevalecendo o último
+        (exceto quando algum campo único é None, caso em que cada item gera
+        sua própria linha). Itens com conjuntos de campos diferentes são
+        enviados em statements separados, e cada um atualiza apenas os campos
+        que informou. Nos demais dialetos cada item passa por upsert().
+        
         Args:
             unique_fields: Lista de campos que identificam unicamente as entidades
             items: Lista de dicionários com dados das entidades
@@ -316,11 +719,17 @@ class Repository(Generic[T]):
         Returns:
             Tuple[List[T], int, int]: Tupla com a lista de entidades, número de criadas e número de atualizadas
         """
+        if not items:
+            return [], 0, 0
+        
         entities = []
         created = 0
         updated = 0
         
         try:
+            if self.session.get_bind().dialect.name == "postgresql":
+                return self._bulk_upsert_postgresql(unique_fields, items)
+            
             for item in items:
                 entity, is_new = self.upsert(unique_fields, item)
                 entities.append(entity)
@@ -333,16 +742,94 @@ class Repository(Generic[T]):
             return entities, created, updated
         except Exception as e:
             self.session.rollback()
-            logger.error(f"Erro ao bulk upsert {self.model_class.__name__}: {str(e)}")
+            _error("Erro ao bulk upsert %s: %s", self.model_class.__name__, e)
             raise DatabaseError(f"Falha ao bulk upsert {self.model_class.__name__}: {str(e)}")
     
+    def _bulk_upsert_postgresql(self, 
+                                unique_fields: List[str], 
+                                items: List[Dict[str, Any]]) -> Tuple[List[T], int, int]:
+        """Executa o bulk upsert com INSERT ... ON CONFLICT DO UPDATE ... RETURNING."""
+        # O PostgreSQL não permite que o mesmo ON CONFLICT afete uma linha duas vezes;
+        # chaves com NULL nunca conflitam, então esses itens não são consolidados
+        rows_data = []
+        positions = {}
+        for item in items:
+            key = tuple(item.get(field) for field in unique_fields)
+            if None in key:
+                rows_data.append(item)
+            elif key in positions:
+                rows_data[positions[key]] = item
+            else:
+                positions[key] = len(rows_data)
+                rows_data.append(item)
+        
+        # Um statement por conjunto de chaves: todas as linhas de um VALUES precisam
+        # das mesmas colunas, e cada grupo atualiza apenas as colunas que informou
+        groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+        for row in rows_data:
+            groups.setdefault(tuple(sorted(row)), []).append(row)
+        
+        entities = []
+        created = 0
+        for keys, rows in groups.items():
+            group_entities, group_created = self._upsert_rows_postgresql(unique_fields, keys, rows)
+            entities.extend(group_entities)
+            created += group_created
+        
+        return entities, created, len(entities) - created
+    
+    def _upsert_rows_postgresql(self, 
+                                unique_fields: List[str], 
+                                keys: Sequence[str], 
+                                rows_data: List[Dict[str, Any]]) -> Tuple[List[T], int]:
+        """Executa o upsert de linhas com as mesmas chaves, em lotes abaixo do limite de parâmetros."""
+        table = self.model_class.__table__
+        stmt = pg_insert(table)
+        
+        update_cols = [key for key in keys if key not in unique_fields and key != "id"]
+        set_ = {key: getattr(stmt.excluded, key) for key in update_cols}
+        if issubclass(self.model_class, BaseModel):
+            set_["updated_at"] = datetime.utcnow()
+        if not set_:
+            # Só há campos únicos: um UPDATE sem efeito ainda devolve a linha existente no RETURNING
+            set_ = {unique_fields[0]: getattr(stmt.excluded, unique_fields[0])}
+        
+        # xmax = 0 identifica as linhas recém-inseridas (sem versão anterior)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=unique_fields,
+            set_=set_
+        ).returning(table.c.id, literal_column("(xmax = 0)").label("created"))
+        
+        # Cada linha do VALUES gera no máximo um parâmetro por coluna (incluindo
+        # defaults do lado Python); os lotes ficam abaixo do limite do PostgreSQL
+        batch_size = max(1, (_PG_MAX_BIND_PARAMS - len(set_)) // len(table.columns))
+        
+        entities = []
+        created = 0
+        for start in range(0, len(rows_data), batch_size):
+            rows = self.session.execute(stmt.values(rows_data[start:start + batch_size])).all()
+            ids = [row.id for row in rows]
+            created += sum(1 for row in rows if row.created)
+            self.invalidate(ids)
+            
+            # Recarrega as entidades do lote em uma consulta, sobrescrevendo o identity map
+            query = (
+                select(self.model_class)
+                .where(self.model_class.id.in_(ids))
+                .execution_options(populate_existing=True)
+            )
+            loaded = {entity.id: entity for entity in self.session.scalars(query)}
+            entities.extend(loaded[entity_id] for entity_id in ids)
+        
+        return entities, created
+    
     def commit(self):
         """Confirma as alterações pendentes na sessão."""
         try:
             self.session.commit()
         except Exception as e:
             self.session.rollback()
-            logger.error(f"Erro ao confirmar transação: {str(e)}")
+            _error("Erro ao confirmar transação: %s", e)
             raise DatabaseError(f"Falha ao confirmar transação: {str(e)}")
     
     def rollback(self):
@@ -350,7 +837,7 @@ class Repository(Generic[T]):
         try:
             self.session.rollback()
         except Exception as e:
-            logger.error(f"Erro ao reverter transação: {str(e)}")
+            _error("Erro ao reverter transação: %s", e)
             raise DatabaseError(f"Falha ao reverter transação: {str(e)}")
     
     def begin_transaction(self):
@@ -358,7 +845,7 @@ class Repository(Generic[T]):
         try:
             self.session.begin_nested()
         except Exception as e:
-            logger.error(f"Erro ao iniciar transação: {str(e)}")
+            _error("Erro ao iniciar transação: %s", e)
             raise DatabaseError(f"Falha ao iniciar transação: {str(e)}")
     
     def close(self):
@@ -366,5 +853,5 @@ class Repository(Generic[T]):
         try:
             self.session.close()
         except Exception as e:
-            logger.error(f"Erro ao fechar sessão: {str(e)}")
+            _error("Erro ao fechar sessão: %s", e)
             raise DatabaseError(f"Falha ao fechar sessão: {str(e)}") 
\ No newline at end of file
@@ -1,39 +1,57 @@
 
 class BPAException(Exception):
     """Classe base para todas as exceções do sistema BPA."""
+    __slots__ = ("message", "code", "details")
+    
     def __init__(self, message, code=None, details=None):
         self.message = message
         self.code = code
         self.details = details or {}
         super().__init__(self.message)
+    
+    def __reduce__(self):
+        # Atributos em slots não entram no __dict__ usado pelo pickle padrão de exceções
+        return (self.__class__, self.args, {"message": self.message, "code": self.code, "details": self.details})
 
 class ValidationError(BPAException):
     """Exceção para erros de validação."""
+    __slots__ = ()
+    
     def __init__(self, message, details=None):
         super().__init__(message, code="VALIDATION_ERROR", details=details)
 
 class DatabaseError(BPAException):
     """Exceção para erros relacionados ao banco de dados."""
+    __slots__ = ()
+    
     def __init__(self, message, details=None):
         super().__init__(message, code="DATABASE_ERROR", details=details)
 
 class FileProcessingError(BPAException):
     """Exceção para erros no processamento de arquivos."""
+    __slots__ = ()
+    
     def __init__(self, message, details=None):
         super().__init__(message, code="FILE_PROCESSING_ERROR", details=details)
 
 class AuthenticationError(BPAException):
     """Exceção para erros de autenticação."""
+    __slots__ = ()
+    
     def __init__(self, message, details=None):
         super().__init__(message, code="AUTHENTICATION_ERROR", details=details)
 
 class ConfigurationError(BPAException):
     """Exceção para erros de configuração."""
+    __slots__ = ()
+    
     def __init__(self, message, details=None):
         super().__init__(message, code="CONFIGURATION_ERROR", details=details)
 
 class ServiceUnavailableError(BPAException):
     """Exceção para serviços indisponíveis."""
+    __slots__ = ()
+    
     def __init__(self, message, details=None):
         super().__init__(message, code="SERVICE_UNAVAILABLE", details=details)
 
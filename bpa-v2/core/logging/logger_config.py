@@ -1,15 +1,34 @@
 import os
+import atexit
+import copy
 import logging
 import json
-from logging.handlers import RotatingFileHandler
-from datetime import datetime
+import queue
+import time
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
+
+try:
+    import orjson
+except ImportError:  # orjson é opcional; sem ele usa-se o json da stdlib
+    orjson = None
+
+def _dumps(data):
+    """Serializa um dicionário de log em JSON, preferindo orjson quando disponível."""
+    if orjson is not None:
+        # Chaves não str (ex.: int) são aceitas pelo json da stdlib; o que o orjson
+        # ainda recusar (inteiros acima de 64 bits, etc.) segue para o json
+        try:
+            return orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            pass
+    return json.dumps(data, default=str)
 
 class JsonFormatter(logging.Formatter):
     """Formatter para saída de logs em formato JSON."""
     
     def format(self, record):
         log_record = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": "%s.%03dZ" % (time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created)), record.msecs),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -26,12 +45,49 @@ class JsonFormatter(logging.Formatter):
         if hasattr(record, "details") and record.details:
             log_record["details"] = record.details
             
-        return json.dumps(log_record)
+        return _dumps(log_record)
+
+class _LocalQueueHandler(QueueHandler):
+    """QueueHandler para fila consumida no próprio processo, preservando exc_info."""
+    
+    def prepare(self, record):
+        # Congela a mensagem, mas mantém exc_info para que o JsonFormatter
+        # registre a exceção em campo próprio no thread do listener
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+# Listeners ativos por nome de logger, encerrados na reconfiguração ou na saída
+_listeners = {}
+
+def stop_logging(module_name=None):
+    """
+    Encerra o listener de logging em segundo plano, descarregando a fila.
+    
+    Args:
+        module_name: Nome do módulo usado em setup_logging (None encerra todos)
+    """
+    if module_name is None:
+        names = list(_listeners)
+    else:
+        names = [module_name]
+    
+    for name in names:
+        listener = _listeners.pop(name, None)
+        if listener:
+            listener.stop()
+
+atexit.register(stop_logging)
 
 def setup_logging(log_dir="logs", log_level=logging.INFO, module_name=None):
     """
     Configura o sistema de logging centralizado.
     
+    A escrita em console e arquivo é feita por um QueueListener em thread
+    separada, de modo que as chamadas de log não bloqueiam em I/O. Use
+    stop_logging() para descarregar a fila antes de encerrar o processo.
+    
     Args:
         log_dir: Diretório onde os logs serão armazenados
         log_level: Nível de logging (default: INFO)
@@ -43,6 +99,11 @@ def setup_logging(log_dir="logs", log_level=logging.INFO, module_name=None):
     # Garante que o diretório de logs existe
     os.makedirs(log_dir, exist_ok=True)
     
+    # Nenhum formatter usa thread/processo; evita coletá-los em cada registro
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+    
     # Define o nome do logger e do arquivo
     logger_name = module_name or "bpa-v2"
     log_file = os.path.join(log_dir, f"{logger_name}.log")
@@ -54,6 +115,7 @@ def setup_logging(log_dir="logs", log_level=logging.INFO, module_name=None):
     # Remove handlers existentes para evitar duplicação em caso de reinicialização
     if logger.handlers:
         logger.handlers.clear()
+    stop_logging(logger_name)
     
     # Handler para saída no console
     console_handler = logging.StreamHandler()
@@ -65,15 +127,20 @@ def setup_logging(log_dir="logs", log_level=logging.INFO, module_name=None):
     file_handler = RotatingFileHandler(
         filename=log_file,
         maxBytes=10*1024*1024,  # 10MB
-        backupCount=5
+        backupCount=5,
+        delay=True
     )
     file_handler.setLevel(log_level)
     file_formatter = JsonFormatter()
     file_handler.setFormatter(file_formatter)
     
-    # Adiciona os handlers ao logger
-    logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
+    # Os handlers são atendidos pelo listener; o logger só enfileira os registros
+    log_queue = queue.Queue(-1)
+    listener = QueueListener(log_queue, console_handler, file_handler, respect_handler_level=True)
+    listener.start()
+    _listeners[logger_name] = listener
+    
+    logger.addHandler(_LocalQueueHandler(log_queue))
     
     logger.info(f"Logger '{logger_name}' configurado com sucesso. Nível: {logging.getLevelName(log_level)}")
     
@@ -1,9 +1,19 @@
 from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Text, Float
 from sqlalchemy.orm import relationship
 from datetime import datetime
+import json
 
 from bpa_v2.core.database.base_model import BaseModel
 
+# Conversores de Configuracao.valor por tipo; tipos não listados permanecem string
+_TRUTHY = frozenset({"true", "1", "sim", "yes"})
+_VALOR_PARSERS = {
+    "int": int,
+    "float": float,
+    "boolean": lambda valor: valor.lower() in _TRUTHY,
+    "json": json.loads,
+}
+
 class Usuario(BaseModel):
     """Modelo para usuários do sistema."""
     
@@ -17,7 +27,7 @@ class Usuario(BaseModel):
     ativo = Column(Boolean, default=True, nullable=False)
     
     # Campos de acesso e perfil
-    role = Column(String(50), nullable=False, default="usuario")
+    role = Column(String(50), nullable=False, default="usuario", index=True)
     ultimo_acesso = Column(DateTime, nullable=True)
     
     # Campos de auditoria
@@ -27,7 +37,7 @@ class Usuario(BaseModel):
     tokens = relationship("TokenAcesso", back_populates="usuario", cascade="all, delete-orphan")
     
     def __repr__(self):
-        return f"<Usuario {self.username}>"
+        return "<Usuario %s>" % self.username
 
 
 class TokenAcesso(BaseModel):
@@ -49,7 +59,7 @@ class TokenAcesso(BaseModel):
     usuario = relationship("Usuario", back_populates="tokens")
     
     def __repr__(self):
-        return f"<TokenAcesso {self.tipo} para {self.usuario_id}>"
+        return "<TokenAcesso %s para %s>" % (self.tipo, self.usuario_id)
 
 
 class LogAuditoria(BaseModel):
@@ -58,12 +68,12 @@ class LogAuditoria(BaseModel):
     __tablename__ = "logs_auditoria"
     
     # Campos de identificação
-    usuario_id = Column(Integer, nullable=True)
+    usuario_id = Column(Integer, nullable=True, index=True)
     username = Column(String(50), nullable=True)
     
     # Campos de evento
-    acao = Column(String(50), nullable=False)
-    recurso = Column(String(100), nullable=False)
+    acao = Column(String(50), nullable=False, index=True)
+    recurso = Column(String(100), nullable=False, index=True)
     recurso_id = Column(String(50), nullable=True)
     
     # Detalhes da ação
@@ -76,7 +86,7 @@ class LogAuditoria(BaseModel):
     user_agent = Column(String(255), nullable=True)
     
     def __repr__(self):
-        return f"<LogAuditoria {self.acao} em {self.recurso} por {self.username}>"
+        return "<LogAuditoria %s em %s por %s>" % (self.acao, self.recurso, self.username)
 
 
 class Configuracao(BaseModel):
@@ -96,21 +106,13 @@ class Configuracao(BaseModel):
     editavel = Column(Boolean, default=True, nullable=False)
     
     def __repr__(self):
-        return f"<Configuracao {self.chave}={self.valor[:20]}>"
+        # valor pode ser NULL; o repr não deve falhar em logs e mensagens de erro
+        valor = self.valor
+        return "<Configuracao %s=%s>" % (self.chave, valor[:20] if valor else "NULL")
     
     def get_valor_tipado(self):
         """Retorna o valor convertido para o tipo correto."""
-        if self.valor is None:
+        valor = self.valor
+        if valor is None:
             return None
-            
-        if self.tipo == "int":
-            return int(self.valor)
-        elif self.tipo == "float":
-            return float(self.valor)
-        elif self.tipo == "boolean":
-            return self.valor.lower() in ("true", "1", "sim", "yes")
-        elif self.tipo == "json":
-            import json
-            return json.loads(self.valor)
-        else:
-            return self.valor 
\ No newline at end of file
+        return _VALOR_PARSERS.get(self.tipo, str)(valor)
\ No newline at end of file
@@ -1,20 +1,59 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Text, Float, JSON, Enum
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, SmallInteger, String, DateTime, Boolean, ForeignKey, Text, Float, LargeBinary, Index, select
+from sqlalchemy.types import TypeDecorator
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import relationship, joinedload, selectinload
 import enum
 from datetime import datetime
 
 from bpa_v2.core.database.base_model import BaseModel
 
 
-class StatusDocumento(enum.Enum):
-    """Enumeração de status possíveis para documentos."""
-    RASCUNHO = "rascunho"
-    AGUARDANDO_ANALISE = "aguardando_analise"
-    EM_ANALISE = "em_analise"
-    APROVADO = "aprovado"
-    REJEITADO = "rejeitado"
-    CANCELADO = "cancelado"
-    ARQUIVADO = "arquivado"
+class StatusDocumento(enum.IntEnum):
+    """
+    Enumeração de status possíveis para documentos.
+    
+    Os valores são gravados como SMALLINT; não altere os números existentes,
+    apenas acrescente novos.
+    """
+    RASCUNHO = 1
+    AGUARDANDO_ANALISE = 2
+    EM_ANALISE = 3
+    APROVADO = 4
+    REJEITADO = 5
+    CANCELADO = 6
+    ARQUIVADO = 7
+
+
+class StatusDocumentoType(TypeDecorator):
+    """
+    Armazena StatusDocumento como SMALLINT e devolve o membro da enumeração.
+    
+    Aceita também o nome do status em texto ("rascunho", "em_analise", ...),
+    formato usado pela coluna Enum anterior.
+    
+    Migração de uma tabela existente (PostgreSQL):
+        ALTER TABLE documentos ALTER COLUMN status TYPE SMALLINT USING (CASE status
+            WHEN 'RASCUNHO' THEN 1 WHEN 'AGUARDANDO_ANALISE' THEN 2 WHEN 'EM_ANALISE' THEN 3
+            WHEN 'APROVADO' THEN 4 WHEN 'REJEITADO' THEN 5 WHEN 'CANCELADO' THEN 6
+            WHEN 'ARQUIVADO' THEN 7 END);
+    O mesmo vale para historico_documento.status_anterior/status_novo; em seguida
+    DROP TYPE statusdocumento.
+    """
+    
+    impl = SmallInteger
+    cache_ok = True
+    
+    def process_bind_param(self, value, dialect):
+        if value is None or value.__class__ is int:
+            return value
+        if isinstance(value, str):
+            return int(StatusDocumento[value.upper()])
+        return int(value)
+    
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return StatusDocumento(value)
 
 
 class TipoDocumento(BaseModel):
@@ -33,23 +72,36 @@ class TipoDocumento(BaseModel):
     formato_arquivo = Column(String(10), nullable=True)  # pdf, docx, xlsx, etc.
     
     # Configurações de processamento
-    schema_validacao = Column(JSON, nullable=True)
+    schema_validacao = Column(JSONB, nullable=True)
     workflow_id = Column(Integer, nullable=True)
     
     # Relacionamentos
     documentos = relationship("Documento", back_populates="tipo_documento")
     
     def __repr__(self):
-        return f"<TipoDocumento {self.codigo} - {self.nome}>"
+        return "<TipoDocumento %s - %s>" % (self.codigo, self.nome)
 
 
 class Documento(BaseModel):
     """Modelo para documentos processados pelo sistema."""
     
     __tablename__ = "documentos"
+    __table_args__ = (
+        # Cobre filtros por status e por status + período de referência
+        Index("ix_doc_status_data", "status", "data_referencia"),
+        # Atende consultas de containment: Documento.conteudo_json.contains({...})
+        Index(
+            "ix_documento_conteudo_gin",
+            "conteudo_json",
+            postgresql_using="gin",
+            postgresql_ops={"conteudo_json": "jsonb_path_ops"}
+        ),
+        # Busca de duplicatas pelo hash do arquivo
+        Index("ix_doc_hash", "arquivo_hash"),
+    )
     
     # Chaves estrangeiras
-    tipo_documento_id = Column(Integer, ForeignKey("tipos_documento.id"), nullable=False)
+    tipo_documento_id = Column(Integer, ForeignKey("tipos_documento.id"), nullable=False, index=True)
     cadastrado_por = Column(Integer, ForeignKey("usuarios.id"), nullable=False)
     
     # Campos de identificação
@@ -57,32 +109,47 @@ class Documento(BaseModel):
     titulo = Column(String(200), nullable=False)
     
     # Metadados
-    data_referencia = Column(DateTime, nullable=False)
+    data_referencia = Column(DateTime, nullable=False, index=True)
     versao = Column(String(20), default="1.0", nullable=False)
     
     # Campos de processamento
-    status = Column(Enum(StatusDocumento), default=StatusDocumento.RASCUNHO, nullable=False)
+    status = Column(StatusDocumentoType(), default=StatusDocumento.RASCUNHO, nullable=False)
     data_envio = Column(DateTime, nullable=True)
     data_aprovacao = Column(DateTime, nullable=True)
     aprovado_por = Column(Integer, ForeignKey("usuarios.id"), nullable=True)
     
     # Conteúdo e metadados
-    conteudo_json = Column(JSON, nullable=True)
+    conteudo_json = Column(JSONB, nullable=True)
     observacoes = Column(Text, nullable=True)
     
     # Campos de arquivo
     arquivo_path = Column(String(255), nullable=True)
     arquivo_nome = Column(String(100), nullable=True)
-    arquivo_hash = Column(String(64), nullable=True)
+    arquivo_hash = Column(LargeBinary(32), nullable=True)  # SHA-256 bruto (hashlib.sha256().digest())
     arquivo_tamanho = Column(Integer, nullable=True)
     
     # Relacionamentos
-    tipo_documento = relationship("TipoDocumento", back_populates="documentos")
+    tipo_documento = relationship("TipoDocumento", back_populates="documentos", lazy="selectin")
     historico = relationship("HistoricoDocumento", back_populates="documento", cascade="all, delete-orphan")
     comentarios = relationship("ComentarioDocumento", back_populates="documento", cascade="all, delete-orphan")
     
     def __repr__(self):
-        return f"<Documento {self.numero} - {self.titulo}>"
+        return "<Documento %s - %s>" % (self.numero, self.titulo)
+    
+    @classmethod
+    def with_full_graph(cls):
+        """
+        Retorna um select de documentos com tipo, histórico e comentários
+        carregados antecipadamente, evitando N+1 consultas ao iterar o resultado.
+        
+        Returns:
+            Select: Consulta a ser filtrada e executada com session.scalars()
+        """
+        return select(cls).options(
+            joinedload(cls.tipo_documento),
+            selectinload(cls.historico),
+            selectinload(cls.comentarios)
+        )
 
 
 class HistoricoDocumento(BaseModel):
@@ -99,18 +166,18 @@ class HistoricoDocumento(BaseModel):
     
     # Campos do evento
     acao = Column(String(50), nullable=False)
-    status_anterior = Column(Enum(StatusDocumento), nullable=True)
-    status_novo = Column(Enum(StatusDocumento), nullable=True)
+    status_anterior = Column(StatusDocumentoType(), nullable=True)
+    status_novo = Column(StatusDocumentoType(), nullable=True)
     
     # Detalhes
     descricao = Column(Text, nullable=True)
-    metadados = Column(JSON, nullable=True)
+    metadados = Column(JSONB, nullable=True)
     
     # Relacionamentos
     documento = relationship("Documento", back_populates="historico")
     
     def __repr__(self):
-        return f"<HistoricoDocumento {self.acao} em {self.documento_id}>"
+        return "<HistoricoDocumento %s em %s>" % (self.acao, self.documento_id)
 
 
 class ComentarioDocumento(BaseModel):
@@ -134,4 +201,4 @@ class ComentarioDocumento(BaseModel):
     documento = relationship("Documento", back_populates="comentarios")
     
     def __repr__(self):
-        return f"<ComentarioDocumento {self.id} em {self.documento_id}>" 
\ No newline at end of file
+        return "<ComentarioDocumento %s em %s>" % (self.id, self.documento_id) 
\ No newline at end of file
@@ -0,0 +1,123 @@
+import asyncio
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from bpa_v2.core.models.base_models import LogAuditoria
+from bpa_v2.utils.async_utils import run_in_thread
+
+logger = logging.getLogger(__name__)
+
+class AuditBatcher:
+    """
+    Acumula registros de auditoria e os grava em lote na tabela de LogAuditoria.
+    
+    Os eventos são enfileirados em um asyncio.Queue e gravados com um único
+    INSERT em lote a cada `batch_size` eventos ou a cada `flush_interval`
+    segundos, o que ocorrer primeiro. A gravação roda fora do event loop.
+    
+    Se a perda de poucos eventos em caso de queda do servidor for aceitável,
+    a fábrica de sessões pode usar um engine exclusivo para auditoria com
+    connect_args={"options": "-c synchronous_commit=off"}.
+    
+    Exemplo:
+        batcher = AuditBatcher(db.create_session)
+        await batcher.start()
+        await batcher.add(acao="login", recurso="usuarios", usuario_id=1)
+        ...
+        await batcher.stop()
+    """
+    
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        batch_size: int = 500,
+        flush_interval: float = 0.5,
+        max_queue_size: int = 10000
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_size)
+        self._task: Optional[asyncio.Task] = None
+    
+    async def start(self):
+        """Inicia a tarefa de gravação em segundo plano."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+    
+    async def stop(self):
+        """Grava os eventos pendentes e encerra a tarefa de gravação."""
+        if self._task is None:
+            return
+        
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        
+        # Descarrega o que ainda estiver na fila
+        rows = []
+        while not self._queue.empty():
+            rows.append(self._queue.get_nowait())
+        for i in range(0, len(rows), self.batch_size):
+            await self._write(rows[i:i + self.batch_size])
+    
+    async def add(self, **evento: Any):
+        """
+        Enfileira um evento de auditoria.
+        
+        Args:
+            **evento: Campos de LogAuditoria (acao, recurso, usuario_id, ...)
+        """
+        await self._queue.put(evento)
+    
+    async def _run(self):
+        """Agrupa eventos da fila e grava cada lote ao atingir o tamanho ou o intervalo."""
+        loop = asyncio.get_running_loop()
+        
+        while True:
+            rows = [await self._queue.get()]
+            deadline = loop.time() + self.flush_interval
+            
+            try:
+                while len(rows) < self.batch_size:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        rows.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+            except asyncio.CancelledError:
+                # Não perde o lote em montagem ao ser encerrado
+                await self._write(rows)
+                raise
+            
+            await self._write(rows)
+    
+    async def _write(self, rows: List[Dict[str, Any]]):
+        """Grava um lote sem interromper o processamento em caso de falha."""
+        if not rows:
+            return
+        try:
+            await self._insert_batch(rows)
+        except Exception as e:
+            logger.error("Erro ao gravar lote de %s eventos de auditoria: %s", len(rows), e)
+    
+    @run_in_thread
+    def _insert_batch(self, rows: List[Dict[str, Any]]):
+        """Executa o INSERT em lote em uma sessão própria."""
+        session = self.session_factory()
+        try:
+            session.execute(insert(LogAuditoria), rows)
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
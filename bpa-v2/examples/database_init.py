@@ -2,6 +2,8 @@ import os
 import sys
 import logging
 
+from sqlalchemy import insert
+
 # Adiciona a raiz do projeto ao path para importação dos módulos
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
@@ -49,9 +51,12 @@ def main():
         session = db.create_session()
         
         # Exemplo: Verifica se já existe algum usuário admin
-        usuarios_admin = session.query(Usuario).filter_by(role="admin").count()
+        # EXISTS para na primeira linha encontrada, ao contrário de COUNT(*)
+        existe_admin = session.query(
+            session.query(Usuario).filter_by(role="admin").exists()
+        ).scalar()
         
-        if usuarios_admin == 0:
+        if not existe_admin:
             logger.info("Criando usuário administrador padrão")
             
             # Importa AuthService para criar hash da senha
@@ -70,62 +75,57 @@ def main():
             session.add(admin)
         
         # Exemplo: Cria alguns tipos de documento
-        if session.query(TipoDocumento).count() == 0:
+        if not session.query(session.query(TipoDocumento).exists()).scalar():
             logger.info("Criando tipos de documento padrão")
             
-            tipos = [
-                TipoDocumento(
-                    codigo="BPA-I",
-                    nome="Boletim de Produção Ambulatorial - I",
-                    descricao="Registro individualizado",
-                    prazo_dias=30,
-                    formato_arquivo="csv"
-                ),
-                TipoDocumento(
-                    codigo="BPA-C",
-                    nome="Boletim de Produção Ambulatorial - Consolidado",
-                    descricao="Registro consolidado",
-                    prazo_dias=30,
-                    formato_arquivo="csv"
-                )
-            ]
-            
-            for tipo in tipos:
-                session.add(tipo)
+            # Insere todas as linhas em um único INSERT em lote
+            session.execute(insert(TipoDocumento), [
+                {
+                    "codigo": "BPA-I",
+                    "nome": "Boletim de Produção Ambulatorial - I",
+                    "descricao": "Registro individualizado",
+                    "prazo_dias": 30,
+                    "formato_arquivo": "csv"
+                },
+                {
+                    "codigo": "BPA-C",
+                    "nome": "Boletim de Produção Ambulatorial - Consolidado",
+                    "descricao": "Registro consolidado",
+                    "prazo_dias": 30,
+                    "formato_arquivo": "csv"
+                }
+            ])
         
         # Exemplo: Cria algumas configurações do sistema
-        if session.query(Configuracao).count() == 0:
+        if not session.query(session.query(Configuracao).exists()).scalar():
             logger.info("Criando configurações padrão do sistema")
             
-            configs = [
-                Configuracao(
-                    chave="SISTEMA_NOME",
-                    valor="BPA Manager V2",
-                    descricao="Nome do sistema",
-                    tipo="string",
-                    grupo="sistema",
-                    nivel="sistema"
-                ),
-                Configuracao(
-                    chave="LIMITE_ARQUIVOS",
-                    valor="10",
-                    descricao="Limite de arquivos por lote",
-                    tipo="int",
-                    grupo="processamento",
-                    nivel="sistema"
-                ),
-                Configuracao(
-                    chave="PROC_AUTOMATICO",
-                    valor="true",
-                    descricao="Processar arquivos automaticamente após upload",
-                    tipo="boolean",
-                    grupo="processamento",
-                    nivel="sistema"
-                )
-            ]
-            
-            for config in configs:
-                session.add(config)
+            session.execute(insert(Configuracao), [
+                {
+                    "chave": "SISTEMA_NOME",
+                    "valor": "BPA Manager V2",
+                    "descricao": "Nome do sistema",
+                    "tipo": "string",
+                    "grupo": "sistema",
+                    "nivel": "sistema"
+                },
+                {
+                    "chave": "LIMITE_ARQUIVOS",
+                    "valor": "10",
+                    "descricao": "Limite de arquivos por lote",
+                    "tipo": "int",
+                    "grupo": "processamento",
+                    "nivel": "sistema"
+                },
+                {
+                    "chave": "PROC_AUTOMATICO",
+                    "valor": "true",
+                    "descricao": "Processar arquivos automaticamente após upload",
+                    "tipo": "boolean",
+                    "grupo": "processamento",
+                    "nivel": "sistema"
+                }
+            ])
         
         # Confirma as alterações no banco
         session.commit()
@@ -1,7 +1,14 @@
 import asyncio
+import inspect
 import logging
-from functools import wraps
-from typing import Any, Callable, List, Dict, Optional, TypeVar, Coroutine, Union
+import os
+import random
+import sys
+import threading
+from collections import deque
+from functools import wraps, partial
+from itertools import islice
+from typing import Any, Callable, List, Dict, Optional, TypeVar, Coroutine, Union, Deque
 import time
 from concurrent.futures import ThreadPoolExecutor
 
@@ -10,10 +17,45 @@ from bpa_v2.core.exceptions.exceptions import ServiceUnavailableError
 T = TypeVar('T')
 logger = logging.getLogger(__name__)
 
+# asyncio.timeout() está disponível a partir do Python 3.11
+_HAS_ASYNCIO_TIMEOUT = sys.version_info >= (3, 11)
+
+# Executor compartilhado por todas as funções decoradas com run_in_thread
+_shared_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Retorna o executor compartilhado, criando-o no primeiro uso."""
+    global _shared_executor
+    if _shared_executor is None:
+        with _executor_lock:
+            if _shared_executor is None:
+                _shared_executor = ThreadPoolExecutor(
+                    max_workers=min(32, (os.cpu_count() or 1) * 5),
+                    thread_name_prefix="bpa-io"
+                )
+    return _shared_executor
+
+def shutdown_run_in_thread(wait: bool = True):
+    """
+    Encerra o executor compartilhado usado por run_in_thread.
+    Um novo executor é criado se o decorator for usado novamente.
+    
+    Args:
+        wait: Se deve aguardar a conclusão das tarefas pendentes
+    """
+    global _shared_executor
+    with _executor_lock:
+        executor, _shared_executor = _shared_executor, None
+    if executor is not None:
+        executor.shutdown(wait=wait)
+
 def run_in_thread(func):
     """
     Decorator para executar uma função em uma thread separada.
-    Útil para operações de I/O bloqueantes.
+    Útil para operações de I/O bloqueantes. As chamadas compartilham um
+    único ThreadPoolExecutor do processo; use shutdown_run_in_thread()
+    no encerramento da aplicação.
     
     Args:
         func: A função a ser executada em thread separada
@@ -23,32 +65,67 @@ def run_in_thread(func):
     """
     @wraps(func)
     async def wrapper(*args, **kwargs):
-        loop = asyncio.get_event_loop()
-        with ThreadPoolExecutor() as executor:
-            return await loop.run_in_executor(
-                executor,
-                lambda: func(*args, **kwargs)
-            )
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_executor(), partial(func, *args, **kwargs))
     return wrapper
 
 async def gather_with_concurrency(concurrency: int, *tasks):
     """
     Executa tarefas assíncronas com um limite de concorrência.
     
+    As tarefas são consumidas sob demanda por `concurrency` workers, de modo
+    que apenas `concurrency` coroutines ficam ativas ao mesmo tempo. Para não
+    materializar todas as coroutines de antemão, passe um único iterável
+    (por exemplo um gerador) ou fábricas sem argumentos que criam a coroutine.
+    
     Args:
         concurrency: Número máximo de tarefas simultâneas
-        *tasks: Tarefas assíncronas a serem executadas
+        *tasks: Awaitables ou fábricas de awaitables, ou um único iterável deles
         
     Returns:
         List[Any]: Resultados das tarefas na ordem em que foram passadas
+        
+    Raises:
+        Exception: A primeira exceção de uma tarefa; as tarefas em execução
+            nos demais workers são canceladas e as restantes do iterável são
+            consumidas sem executar (coroutines são fechadas)
     """
-    semaphore = asyncio.Semaphore(concurrency)
+    if len(tasks) == 1 and not inspect.isawaitable(tasks[0]) and not callable(tasks[0]):
+        source = iter(tasks[0])
+    else:
+        source = iter(tasks)
+    
+    # Iterador compartilhado pelos workers; o índice preserva a ordem dos resultados
+    pending = enumerate(source)
+    results: Dict[int, Any] = {}
+    
+    async def worker():
+        for index, task in pending:
+            if not inspect.isawaitable(task):
+                task = task()
+            results[index] = await task
     
-    async def sem_task(task):
-        async with semaphore:
-            return await task
+    workers = [asyncio.create_task(worker()) for _ in range(max(1, concurrency))]
+    try:
+        done, _ = await asyncio.wait(workers, return_when=asyncio.FIRST_EXCEPTION)
+        for task in done:
+            task.result()
+    finally:
+        # Na primeira falha, os demais workers param de consumir tarefas
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        
+        # Fecha as coroutines que não chegaram a ser iniciadas, evitando o aviso "never awaited"
+        for _, task in pending:
+            if inspect.iscoroutine(task):
+                task.close()
     
-    return await asyncio.gather(*(sem_task(task) for task in tasks))
+    return [results[index] for index in range(len(results))]
+
+def _backoff_delays(max_retries: int, delay: float, backoff_factor: float, cap: float) -> List[float]:
+    """Calcula de uma vez os tempos de espera exponenciais, limitados por cap."""
+    return [min(cap, delay * (backoff_factor ** i)) for i in range(max_retries)]
 
 async def retry_async(
     coroutine_func: Callable[..., Coroutine], 
@@ -56,6 +133,7 @@ async def retry_async(
     max_retries: int = 3, 
     delay: float = 1.0, 
     backoff_factor: float = 2.0, 
+    cap: float = 30.0,
     exceptions: tuple = (Exception,), 
     **kwargs
 ) -> Any:
@@ -68,6 +146,7 @@ async def retry_async(
         max_retries: Número máximo de tentativas
         delay: Tempo de espera inicial entre tentativas (segundos)
         backoff_factor: Fator de aumento do tempo de espera entre tentativas
+        cap: Tempo máximo de espera entre tentativas (segundos), antes do jitter
         exceptions: Exceções que acionam novas tentativas
         **kwargs: Argumentos nomeados para a função
         
@@ -78,7 +157,7 @@ async def retry_async(
         Exception: A última exceção encontrada após todas as tentativas
     """
     retry_count = 0
-    current_delay = delay
+    delays = _backoff_delays(max_retries, delay, backoff_factor, cap)
     last_exception = None
     
     while retry_count <= max_retries:
@@ -91,15 +170,16 @@ async def retry_async(
             if retry_count > max_retries:
                 break
                 
+            # Jitter evita que chamadores falhando juntos retentem em sincronia
+            current_delay = delays[retry_count - 1] * random.uniform(0.5, 1.5)
             logger.warning(
-                f"Tentativa {retry_count}/{max_retries} falhou para {coroutine_func.__name__}: {str(e)}. "
-                f"Aguardando {current_delay:.1f}s antes da próxima tentativa."
+                "Tentativa %d/%d falhou para %s: %s. Aguardando %.1fs antes da próxima tentativa.",
+                retry_count, max_retries, coroutine_func.__name__, e, current_delay
             )
             
             await asyncio.sleep(current_delay)
-            current_delay *= backoff_factor
     
-    logger.error(f"Todas as {max_retries} tentativas falharam para {coroutine_func.__name__}")
+    logger.error("Todas as %d tentativas falharam para %s", max_retries, coroutine_func.__name__)
     if last_exception:
         raise last_exception
     raise ServiceUnavailableError("Falha após múltiplas tentativas")
@@ -110,6 +190,7 @@ def retry_sync(
     max_retries: int = 3, 
     delay: float = 1.0, 
     backoff_factor: float = 2.0, 
+    cap: float = 30.0,
     exceptions: tuple = (Exception,), 
     **kwargs
 ) -> Any:
@@ -122,6 +203,7 @@ def retry_sync(
         max_retries: Número máximo de tentativas
         delay: Tempo de espera inicial entre tentativas (segundos)
         backoff_factor: Fator de aumento do tempo de espera entre tentativas
+        cap: Tempo máximo de espera entre tentativas (segundos), antes do jitter
         exceptions: Exceções que acionam novas tentativas
         **kwargs: Argumentos nomeados para a função
         
@@ -132,7 +214,7 @@ def retry_sync(
         Exception: A última exceção encontrada após todas as tentativas
     """
     retry_count = 0
-    current_delay = delay
+    delays = _backoff_delays(max_retries, delay, backoff_factor, cap)
     last_exception = None
     
     while retry_count <= max_retries:
@@ -145,15 +227,16 @@ def retry_sync(
             if retry_count > max_retries:
                 break
                 
+            # Jitter evita que chamadores falhando juntos retentem em sincronia
+            current_delay = delays[retry_count - 1] * random.uniform(0.5, 1.5)
             logger.warning(
-                f"Tentativa {retry_count}/{max_retries} falhou para {func.__name__}: {str(e)}. "
-                f"Aguardando {current_delay:.1f}s antes da próxima tentativa."
+                "Tentativa %d/%d falhou para %s: %s. Aguardando %.1fs antes da próxima tentativa.",
+                retry_count, max_retries, func.__name__, e, current_delay
             )
             
             time.sleep(current_delay)
-            current_delay *= backoff_factor
     
-    logger.error(f"Todas as {max_retries} tentativas falharam para {func.__name__}")
+    logger.error("Todas as %d tentativas falharam para %s", max_retries, func.__name__)
     if last_exception:
         raise last_exception
     raise ServiceUnavailableError("Falha após múltiplas tentativas")
@@ -161,27 +244,53 @@ def retry_sync(
 async def process_in_batches(
     items: List[Any], 
     batch_size: int, 
-    process_func: Callable[[List[Any]], Coroutine[Any, Any, List[Any]]]
+    process_func: Callable[[List[Any]], Coroutine[Any, Any, List[Any]]],
+    pipeline_depth: int = 1
 ) -> List[Any]:
     """
     Processa uma lista de itens em lotes.
     
+    Por padrão os lotes são processados um de cada vez. Com `pipeline_depth`
+    maior que 1, até esse número de lotes fica em processamento simultâneo,
+    de modo que o próximo lote já é enviado enquanto o anterior aguarda I/O;
+    use apenas se `process_func` puder ser executada concorrentemente (por
+    exemplo, sem compartilhar uma sessão de banco). A ordem dos resultados
+    segue a ordem dos lotes.
+    
     Args:
         items: Lista de itens para processar
         batch_size: Tamanho do lote
         process_func: Função assíncrona que processa um lote
+        pipeline_depth: Número máximo de lotes em processamento simultâneo (1 = sequencial)
         
     Returns:
         List[Any]: Lista combinada de resultados
     """
     results = []
+    pending: Deque[asyncio.Task] = deque()
+    total = len(items)
+    iterator = iter(items)
+    start = 0
     
-    for i in range(0, len(items), batch_size):
-        batch = items[i:i + batch_size]
-        logger.info(f"Processando lote de {len(batch)} itens ({i+1}-{i+len(batch)} de {len(items)})")
+    try:
+        while True:
+            batch = list(islice(iterator, batch_size))
+            if not batch:
+                break
+            
+            logger.info("Processando lote de %d itens (%d-%d de %d)", len(batch), start + 1, start + len(batch), total)
+            start += len(batch)
+            
+            pending.append(asyncio.create_task(process_func(batch)))
+            if len(pending) >= pipeline_depth:
+                results.extend(await pending.popleft())
         
-        batch_results = await process_func(batch)
-        results.extend(batch_results)
+        while pending:
+            results.extend(await pending.popleft())
+    finally:
+        # Em caso de erro, não deixa lotes órfãos em execução
+        for task in pending:
+            task.cancel()
         
     return results
 
@@ -201,7 +310,11 @@ async def timeout_after(seconds: float, coroutine: Coroutine, message: str = "Op
         ServiceUnavailableError: Se a operação exceder o tempo limite
     """
     try:
+        if _HAS_ASYNCIO_TIMEOUT:
+            # asyncio.timeout() não cria uma Task extra em torno da coroutine
+            async with asyncio.timeout(seconds):
+                return await coroutine
         return await asyncio.wait_for(coroutine, timeout=seconds)
     except asyncio.TimeoutError:
-        logger.error(f"Timeout após {seconds}s: {message}")
+        logger.error("Timeout após %ss: %s", seconds, message)
         raise ServiceUnavailableError(message) 
\ No newline at end of file
@@ -1,14 +1,38 @@
 import os
 from typing import Any, Dict, List, Optional, Union
-from pydantic import BaseSettings, validator, Field
+from pydantic import Field, PrivateAttr, field_validator
+from pydantic_settings import BaseSettings, SettingsConfigDict
 import json
 import yaml
 from pathlib import Path
 import logging
+from functools import lru_cache
+from urllib.parse import quote
 from dotenv import load_dotenv
 
 from bpa_v2.core.exceptions.exceptions import ConfigurationError
 
+# Usa o loader em C (libyaml) quando o PyYAML foi compilado com ele
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+try:
+    import orjson
+except ImportError:  # orjson é opcional; sem ele usa-se o json da stdlib
+    orjson = None
+
+def _parse_json(data):
+    """Interpreta o conteúdo JSON (str ou bytes), preferindo orjson quando disponível."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+# Níveis de log aceitos em LOG_LEVEL
+LOG_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+_LOG_LEVEL_SET = frozenset(LOG_LEVELS)
+
 class BaseBPASettings(BaseSettings):
     """Classe base para configurações do sistema BPA."""
     
@@ -45,26 +69,43 @@ class BaseBPASettings(BaseSettings):
     CACHE_REDIS_URL: Optional[str] = Field(None, description="URL do Redis para cache")
     CACHE_DEFAULT_TIMEOUT: int = Field(300, description="Tempo padrão de expiração do cache em segundos")
     
-    class Config:
-        env_file = ".env"
-        case_sensitive = True
+    # URL de conexão calculada uma única vez em model_post_init
+    _db_url: str = PrivateAttr("")
+    
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        case_sensitive=True,
+        frozen=True
+    )
         
-    @validator("LOG_LEVEL")
+    @field_validator("LOG_LEVEL", mode="after")
+    @classmethod
     def validate_log_level(cls, v):
-        allowed_levels = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
-        if v.upper() not in allowed_levels:
-            raise ValueError(f"Nível de log deve ser um dos seguintes: {', '.join(allowed_levels)}")
-        return v.upper()
+        level = v.upper()
+        if level not in _LOG_LEVEL_SET:
+            raise ValueError(f"Nível de log deve ser um dos seguintes: {', '.join(LOG_LEVELS)}")
+        return level
+    
+    def model_post_init(self, __context: Any) -> None:
+        # Os campos são imutáveis (frozen), então a URL pode ser montada uma vez
+        self._db_url = (
+            f"postgresql+psycopg://{quote(self.DB_USER, safe='')}:{quote(self.DB_PASSWORD, safe='')}"
+            f"@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}?application_name=bpa-v2"
+        )
     
     @property
     def db_url(self) -> str:
-        """Retorna a URL de conexão do banco de dados."""
-        return f"postgresql://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
+        """Retorna a URL de conexão do banco de dados (driver psycopg 3)."""
+        return self._db_url
 
+@lru_cache(maxsize=None)
 def load_config(config_path: Optional[str] = None, env_file: Optional[str] = None) -> BaseBPASettings:
     """
     Carrega configurações a partir de arquivo e/ou variáveis de ambiente.
     
+    O resultado é memorizado por (config_path, env_file); chamadas seguintes
+    retornam a mesma instância. Use reload_config() para forçar nova leitura.
+    
     Args:
         config_path: Caminho para arquivo de configuração (json ou yaml)
         env_file: Caminho para arquivo .env
@@ -84,12 +125,14 @@ def load_config(config_path: Optional[str] = None, env_file: Optional[str] = Non
             if not config_file.exists():
                 logging.warning(f"Arquivo de configuração não encontrado: {config_path}")
             else:
-                if config_file.suffix.lower() in ['.json']:
-                    with open(config_file, 'r') as f:
-                        config_dict = json.load(f)
-                elif config_file.suffix.lower() in ['.yaml', '.yml']:
-                    with open(config_file, 'r') as f:
-                        config_dict = yaml.safe_load(f)
+                # Lê em modo binário: os parsers aceitam bytes e dispensam a decodificação de texto
+                suffix = config_file.suffix.lower()
+                if suffix == '.json':
+                    with open(config_file, 'rb') as f:
+                        config_dict = _parse_json(f.read())
+                elif suffix in ('.yaml', '.yml'):
+                    with open(config_file, 'rb') as f:
+                        config_dict = yaml.load(f.read(), Loader=_YamlLoader)
                 else:
                     logging.warning(f"Formato de arquivo de configuração não suportado: {config_path}")
         
@@ -98,10 +141,24 @@ def load_config(config_path: Optional[str] = None, env_file: Optional[str] = Non
     except Exception as e:
         raise ConfigurationError(f"Erro ao carregar configurações: {str(e)}")
 
+# Configurações compartilhadas por todos os módulos (a ordem define a do resultado)
+_COMMON_KEYS = (
+    "DB_HOST", "DB_PORT", "DB_USER", "DB_PASSWORD", "DB_NAME", "DB_SCHEMA",
+    "LOG_LEVEL", "LOG_DIR", "DEBUG"
+)
+
+def reload_config():
+    """Descarta as configurações memorizadas, forçando nova leitura na próxima chamada."""
+    load_config.cache_clear()
+    _default_module_config.cache_clear()
+
 def get_module_config(module_name: str, config_base: Optional[BaseBPASettings] = None) -> Dict[str, Any]:
     """
     Filtra configurações específicas para um módulo.
     
+    Sem config_base, o resultado é calculado uma vez por módulo a partir de
+    load_config() e reaproveitado até reload_config().
+    
     Args:
         module_name: Nome do módulo (ex: "data-injector", "bpa-gerador")
         config_base: Configurações base (opcional)
@@ -110,30 +167,34 @@ def get_module_config(module_name: str, config_base: Optional[BaseBPASettings] =
         Dict[str, Any]: Configurações específicas do módulo
     """
     if config_base is None:
-        config_base = load_config()
-        
-    # Converte para dicionário
-    config_dict = config_base.dict()
+        # Cópia para que o chamador não altere o valor memorizado
+        return dict(_default_module_config(module_name))
+    return _build_module_config(module_name, config_base)
+
+@lru_cache(maxsize=64)
+def _default_module_config(module_name: str) -> Dict[str, Any]:
+    """Configurações do módulo a partir das configurações padrão memorizadas."""
+    return _build_module_config(module_name, load_config())
+
+def _build_module_config(module_name: str, config_base: BaseBPASettings) -> Dict[str, Any]:
+    """Extrai as configurações do módulo a partir de uma instância de configurações."""
+    # Lê os valores diretamente da instância; model_dump() copiaria todos os campos
+    config_dict = config_base.__dict__
+    if config_base.model_extra:
+        config_dict = {**config_dict, **config_base.model_extra}
     
-    # Filtra configurações com prefixo do módulo
+    # Extrai configurações com prefixo do módulo, removendo o prefixo
     prefix = f"{module_name.upper().replace('-', '_')}_"
-    module_config = {}
-    
-    # Extrai configurações específicas do módulo
-    for key, value in config_dict.items():
-        if key.startswith(prefix):
-            # Remove o prefixo
-            module_key = key[len(prefix):]
-            module_config[module_key] = value
+    prefix_len = len(prefix)
+    module_config = {
+        key[prefix_len:]: value
+        for key, value in config_dict.items()
+        if key.startswith(prefix)
+    }
     
     # Adiciona configurações comuns
-    common_keys = [
-        "DB_HOST", "DB_PORT", "DB_USER", "DB_PASSWORD", "DB_NAME", "DB_SCHEMA",
-        "LOG_LEVEL", "LOG_DIR", "DEBUG"
-    ]
-    
-    for key in common_keys:
+    for key in _COMMON_KEYS:
         if key not in module_config and key in config_dict:
             module_config[key] = config_dict[key]
             
-    return module_config 
\ No newline at end of file
+    return module_config
\ No newline at end of file
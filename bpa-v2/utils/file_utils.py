@@ -1,19 +1,243 @@
 import os
 import zipfile
 import io
-from typing import List, Dict, Any, BinaryIO, Optional, Union
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from operator import attrgetter, itemgetter
+from typing import List, Dict, Any, BinaryIO, Callable, FrozenSet, Iterator, Optional, Tuple, Union
+import codecs
 import csv
+import hashlib
+import queue
+import struct
 import tempfile
+import threading
+import zlib
 
 from bpa_v2.core.exceptions.exceptions import FileProcessingError
 
-def extract_zip_file(zip_data: Union[str, bytes, BinaryIO], target_dir: Optional[str] = None) -> Dict[str, str]:
+try:
+    import deflate  # libdeflate: descompressão DEFLATE mais rápida que o zlib
+except ImportError:  # deflate é opcional; sem ele usa-se o zipfile
+    deflate = None
+
+try:
+    import numpy as np
+except ImportError:  # numpy é opcional; sem ele a leitura de largura fixa é linha a linha
+    np = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:  # pyarrow é opcional; sem ele usa-se o módulo csv
+    pa = pa_csv = None
+
+# Tamanho dos buffers de cópia e de leitura/escrita de arquivos (1MB)
+_BUFFER_SIZE = 1 << 20
+
+# No Windows o descritor precisa ser aberto em modo binário para o os.fdopen(..., 'rb')
+_O_BINARY = getattr(os, 'O_BINARY', 0)
+
+def _fadvise(fd: int, advice: str):
+    """
+    Informa ao kernel o padrão de acesso ao arquivo (posix_fadvise), quando disponível.
+    
+    Args:
+        fd: Descritor do arquivo
+        advice: Nome da constante em os, ex.: 'POSIX_FADV_SEQUENTIAL'
+    """
+    if hasattr(os, 'posix_fadvise') and hasattr(os, advice):
+        try:
+            os.posix_fadvise(fd, 0, 0, getattr(os, advice))
+        except OSError:
+            pass
+
+# Buffers de cópia reaproveitados entre chamadas e threads
+_BUFFER_POOL_MAX = os.cpu_count() or 4
+_buffer_pool: List[bytearray] = []
+_buffer_pool_lock = threading.Lock()
+
+def _rent_buffer() -> bytearray:
+    """Obtém um buffer de cópia do pool, alocando um novo se estiver vazio."""
+    with _buffer_pool_lock:
+        if _buffer_pool:
+            return _buffer_pool.pop()
+    return bytearray(_BUFFER_SIZE)
+
+def _return_buffer(buffer: bytearray):
+    """Devolve um buffer ao pool, descartando-o se o pool estiver cheio."""
+    with _buffer_pool_lock:
+        if len(_buffer_pool) < _BUFFER_POOL_MAX:
+            _buffer_pool.append(buffer)
+
+def _copy_stream(src: BinaryIO, dst: BinaryIO):
+    """Copia src para dst com readinto em um buffer do pool, sem alocar por bloco."""
+    buffer = _rent_buffer()
+    try:
+        with memoryview(buffer) as view:
+            readinto = src.readinto
+            write = dst.write
+            while True:
+                size = readinto(buffer)
+                if not size:
+                    break
+                write(view[:size])
+    finally:
+        _return_buffer(buffer)
+
+# Número mínimo de entradas por thread para que a extração paralela compense
+_MIN_ENTRIES_PER_WORKER = 4
+
+# Tamanho máximo (comprimido e descomprimido) de uma entrada lida inteira na
+# memória pelo libdeflate ou pela extração em pipeline; entradas maiores são copiadas em blocos
+_PIPELINE_MAX_ENTRY = 8 << 20
+
+# Cabeçalho local de cada entrada do ZIP (local file header, 30 bytes)
+_LOCAL_HEADER = struct.Struct("<4s2B4HL2L2H")
+_LOCAL_HEADER_SIGNATURE = b"PK\x03\x04"
+
+def _read_raw_entry(fp: BinaryIO, info: zipfile.ZipInfo) -> bytes:
+    """Lê os bytes comprimidos de uma entrada diretamente do arquivo ZIP."""
+    fp.seek(info.header_offset)
+    header = _LOCAL_HEADER.unpack(fp.read(_LOCAL_HEADER.size))
+    if header[0] != _LOCAL_HEADER_SIGNATURE:
+        raise zipfile.BadZipFile(f"Cabeçalho local inválido para {info.filename}")
+    # Nome e campo extra do cabeçalho local podem diferir dos do diretório central
+    fp.seek(header[10] + header[11], os.SEEK_CUR)
+    return fp.read(info.compress_size)
+
+def _member_path(target_dir: str, name: str) -> str:
+    """Monta o caminho de destino de uma entrada, com a mesma sanitização do zipfile."""
+    arcname = name.replace('/', os.sep)
+    if os.altsep:
+        arcname = arcname.replace(os.altsep, os.sep)
+    arcname = os.path.splitdrive(arcname)[1]
+    arcname = os.sep.join(x for x in arcname.split(os.sep) if x not in ('', os.curdir, os.pardir))
+    if os.sep == '\\':
+        arcname = zipfile.ZipFile._sanitize_windows_name(arcname, os.sep)
+    return os.path.normpath(os.path.join(target_dir, arcname))
+
+def _extract_member(zip_ref: zipfile.ZipFile, info: zipfile.ZipInfo, target_dir: str):
+    """
+    Extrai uma entrada do ZIP.
+    
+    Entradas DEFLATE sem criptografia de até _PIPELINE_MAX_ENTRY bytes são
+    descomprimidas de uma vez com o libdeflate; as demais são copiadas do
+    zipfile em blocos, com um buffer do pool, sem carregar a entrada inteira.
+    """
+    path = _member_path(target_dir, info.filename)
+    if info.is_dir():
+        os.makedirs(path, exist_ok=True)
+        return
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    
+    if (deflate is None or info.compress_type != zipfile.ZIP_DEFLATED
+            or info.flag_bits & 0x1
+            or max(info.compress_size, info.file_size) > _PIPELINE_MAX_ENTRY):
+        with zip_ref.open(info) as src, open(path, 'wb', buffering=0) as dst:
+            _copy_stream(src, dst)
+        return
+    
+    data = deflate.deflate_decompress(_read_raw_entry(zip_ref.fp, info), info.file_size)
+    if zlib.crc32(data) != info.CRC:
+        raise zipfile.BadZipFile(f"CRC inválido para {info.filename}")
+    
+    with open(path, 'wb', buffering=0) as dst:
+        dst.write(data)
+
+# Entradas lidas e ainda não descomprimidas mantidas em memória pela extração em pipeline
+_PIPELINE_QUEUE_SIZE = 8
+
+def _inflate_entry(info: zipfile.ZipInfo, raw: bytes) -> bytes:
+    """Descomprime os bytes brutos de uma entrada STORED ou DEFLATE e confere o CRC."""
+    if info.compress_type == zipfile.ZIP_STORED:
+        data = raw
+    elif deflate is not None:
+        data = deflate.deflate_decompress(raw, info.file_size)
+    else:
+        data = zlib.decompressobj(-15).decompress(raw)
+    if len(data) != info.file_size or zlib.crc32(data) != info.CRC:
+        raise zipfile.BadZipFile(f"CRC inválido para {info.filename}")
+    return data
+
+def _consume_entries(entries: "queue.Queue", target_dir: str):
+    """
+    Descomprime e grava as entradas da fila até receber None.
+    
+    Após um erro continua retirando itens da fila, para que o produtor não
+    fique bloqueado, e relança o erro ao final.
+    """
+    error = None
+    while True:
+        item = entries.get()
+        if item is None:
+            break
+        if error is not None:
+            continue
+        info, raw = item
+        try:
+            data = _inflate_entry(info, raw)
+            with open(_member_path(target_dir, info.filename), 'wb', buffering=0) as dst:
+                dst.write(data)
+        except BaseException as e:
+            error = e
+    if error is not None:
+        raise error
+
+def _extract_all(zip_ref: zipfile.ZipFile, target_dir: str, max_workers: Optional[int] = None):
+    """
+    Extrai todas as entradas, sobrepondo a leitura do ZIP com a descompressão.
+    
+    A thread chamadora lê os bytes comprimidos na ordem em que estão no arquivo
+    e os coloca em uma fila limitada; um grupo de threads descomprime e grava.
+    Entradas grandes, criptografadas ou com outros métodos de compressão são
+    extraídas pela própria thread chamadora, em blocos.
+    """
+    infos = zip_ref.infolist()
+    workers = min(max_workers or os.cpu_count() or 1, len(infos) // _MIN_ENTRIES_PER_WORKER)
+    
+    if workers < 1:
+        for info in infos:
+            _extract_member(zip_ref, info, target_dir)
+        return
+    
+    # Cria os diretórios antes, evitando corrida entre threads ao criá-los
+    directories = {target_dir}
+    for info in infos:
+        path = _member_path(target_dir, info.filename)
+        directories.add(path if info.is_dir() else os.path.dirname(path))
+    for directory in directories:
+        os.makedirs(directory, exist_ok=True)
+    
+    entries = queue.Queue(maxsize=_PIPELINE_QUEUE_SIZE)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_consume_entries, entries, target_dir) for _ in range(workers)]
+        try:
+            # Ordem do arquivo: leitura sequencial do disco
+            for info in sorted(infos, key=attrgetter('header_offset')):
+                if info.is_dir():
+                    continue
+                if (info.compress_type in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED)
+                        and not info.flag_bits & 0x1
+                        and max(info.compress_size, info.file_size) <= _PIPELINE_MAX_ENTRY):
+                    entries.put((info, _read_raw_entry(zip_ref.fp, info)))
+                else:
+                    _extract_member(zip_ref, info, target_dir)
+        finally:
+            for _ in futures:
+                entries.put(None)
+        for future in futures:
+            future.result()
+
+def extract_zip_file(zip_data: Union[str, bytes, BinaryIO], target_dir: Optional[str] = None,
+                     max_workers: Optional[int] = None) -> Dict[str, str]:
     """
     Extrai um arquivo ZIP para um diretório de destino ou para um diretório temporário.
     
     Args:
-        zip_data: Caminho do arquivo ZIP ou objeto de arquivo em memória
+        zip_data: Caminho do arquivo ZIP, conteúdo em bytes ou objeto de arquivo em memória
         target_dir: Diretório de destino (opcional)
+        max_workers: Número máximo de threads de extração (padrão: os.cpu_count())
         
     Returns:
         Dict[str, str]: Mapeamento de nomes de arquivos para caminhos extraídos
@@ -22,61 +246,213 @@ def extract_zip_file(zip_data: Union[str, bytes, BinaryIO], target_dir: Optional
         if target_dir is None:
             target_dir = tempfile.mkdtemp()
         
-        extracted_files = {}
+        # O ZipFile aceita tanto o caminho quanto o objeto de arquivo; bytes são o conteúdo do ZIP
+        if isinstance(zip_data, (bytes, bytearray)):
+            zip_data = io.BytesIO(zip_data)
         
-        # Se zip_data for string, assume que é o caminho para um arquivo
-        if isinstance(zip_data, str):
-            if not os.path.exists(zip_data):
-                raise FileProcessingError(f"Arquivo ZIP não encontrado: {zip_data}")
-            with zipfile.ZipFile(zip_data, 'r') as zip_ref:
-                zip_ref.extractall(target_dir)
-                extracted_files = {f: os.path.join(target_dir, f) for f in zip_ref.namelist()}
-        else:
-            # Caso contrário, assume que é um objeto de arquivo em memória
-            with zipfile.ZipFile(zip_data, 'r') as zip_ref:
-                zip_ref.extractall(target_dir)
-                extracted_files = {f: os.path.join(target_dir, f) for f in zip_ref.namelist()}
-        
-        return extracted_files
+        with zipfile.ZipFile(zip_data, 'r') as zip_ref:
+            _extract_all(zip_ref, target_dir, max_workers)
+            # Prefixo calculado uma vez, com o mesmo resultado de os.path.join(target_dir, f)
+            prefix = target_dir
+            if prefix and not prefix.endswith((os.sep, os.altsep or os.sep)):
+                prefix += os.sep
+            return {f: prefix + f for f in zip_ref.namelist()}
+    except FileNotFoundError as e:
+        if e.filename != zip_data:
+            raise FileProcessingError(f"Erro ao extrair arquivo ZIP: {str(e)}")
+        raise FileProcessingError(f"Arquivo ZIP não encontrado: {zip_data}")
     except zipfile.BadZipFile:
         raise FileProcessingError("Arquivo ZIP inválido ou corrompido")
     except Exception as e:
         raise FileProcessingError(f"Erro ao extrair arquivo ZIP: {str(e)}")
 
-def create_zip_file(files_to_zip: Dict[str, str], output_path: Optional[str] = None) -> Union[str, bytes]:
+# Extensões de formatos já comprimidos: gravados sem compressão (ZIP_STORED),
+# pois o DEFLATE consome CPU sem reduzir o tamanho
+STORED_EXTS = frozenset({'.png', '.jpg', '.jpeg', '.pdf', '.zip', '.gz', '.xz', '.zst', '.webp'})
+
+def _write_zip_entry(zip_file: zipfile.ZipFile, local_path: str, zip_path: str):
+    """Adiciona um arquivo ao ZIP copiando-o com um buffer do pool."""
+    info = zipfile.ZipInfo.from_file(local_path, zip_path)
+    if info.is_dir():
+        zip_file.write(local_path, zip_path)
+        return
+    if os.path.splitext(local_path)[1].lower() in STORED_EXTS:
+        info.compress_type = zipfile.ZIP_STORED
+    else:
+        info.compress_type = zip_file.compression
+        # ZipFile.open(info, 'w') usa o nível definido no ZipInfo, não o do ZipFile
+        # (atributo público a partir do Python 3.13)
+        if hasattr(info, 'compress_level'):
+            info.compress_level = zip_file.compresslevel
+        else:
+            info._compresslevel = zip_file.compresslevel
+    with open(local_path, 'rb', buffering=0) as src, zip_file.open(info, 'w') as dst:
+        _copy_stream(src, dst)
+
+def create_zip_file(files_to_zip: Dict[str, str], output_path: Optional[str] = None,
+                    compresslevel: Optional[int] = None,
+                    return_buffer: bool = False) -> Union[str, bytes, io.BytesIO]:
     """
     Cria um arquivo ZIP contendo os arquivos especificados.
     
+    Arquivos com extensão de formato já comprimido (STORED_EXTS) são gravados
+    sem compressão.
+    
     Args:
         files_to_zip: Dicionário mapeando nomes de arquivo dentro do ZIP para caminhos locais
         output_path: Caminho onde o arquivo ZIP será salvo (opcional)
+        compresslevel: Nível do DEFLATE, de 0 a 9; 1 é o mais rápido (padrão do zlib se None)
+        return_buffer: Se True e output_path for None, retorna o BytesIO posicionado
+            no início em vez dos bytes, para ser lido em partes pelo chamador
         
     Returns:
-        Union[str, bytes]: Caminho do arquivo ZIP criado ou bytes se output_path for None
+        Union[str, bytes, io.BytesIO]: Caminho do arquivo ZIP criado, ou bytes/BytesIO se output_path for None
     """
     try:
         if output_path:
-            with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+            with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=compresslevel) as zip_file:
                 for zip_path, local_path in files_to_zip.items():
                     if os.path.exists(local_path):
-                        zip_file.write(local_path, zip_path)
+                        _write_zip_entry(zip_file, local_path, zip_path)
                     else:
                         raise FileProcessingError(f"Arquivo não encontrado: {local_path}")
             return output_path
         else:
             # Criar ZIP em memória
             zip_buffer = io.BytesIO()
-            with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+            with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED, compresslevel=compresslevel) as zip_file:
                 for zip_path, local_path in files_to_zip.items():
                     if os.path.exists(local_path):
-                        zip_file.write(local_path, zip_path)
+                        _write_zip_entry(zip_file, local_path, zip_path)
                     else:
                         raise FileProcessingError(f"Arquivo não encontrado: {local_path}")
             zip_buffer.seek(0)
+            if return_buffer:
+                return zip_buffer
+            # getvalue() reaproveita o buffer interno do BytesIO sem copiá-lo
             return zip_buffer.getvalue()
     except Exception as e:
         raise FileProcessingError(f"Erro ao criar arquivo ZIP: {str(e)}")
 
+# Codificações compatíveis com ASCII de um byte por caractere (posição em bytes = posição em caracteres)
+_SINGLE_BYTE_ENCODINGS = frozenset({"ascii", "iso8859-1", "iso8859-15", "cp1252", "cp850", "cp437"})
+
+# Tamanho mínimo do arquivo para compensar a leitura vetorizada com NumPy
+_NUMPY_MIN_BYTES = 1 << 16
+
+@lru_cache(maxsize=16)
+def _byte_tables(encoding: str):
+    """
+    Tabelas de 256 posições para uma codificação de um byte: o código Unicode
+    de cada byte, se o byte é válido na codificação e se é removido por str.strip().
+    """
+    codepoints = np.zeros(256, dtype=np.uint32)
+    valid = np.zeros(256, dtype=bool)
+    for byte in range(256):
+        try:
+            codepoints[byte] = ord(bytes((byte,)).decode(encoding))
+            valid[byte] = True
+        except UnicodeDecodeError:
+            pass
+    whitespace = valid & np.array([chr(c).isspace() for c in codepoints.tolist()])
+    return codepoints, valid, whitespace
+
+def _read_fixed_width_numpy(file_path: str, column_specs: List[Dict[str, Any]],
+                            encoding: str, skip_header: bool) -> Optional[List[Dict[str, str]]]:
+    """
+    Lê um arquivo de largura fixa tratando os registros como uma matriz de bytes do NumPy.
+    
+    Só se aplica quando todos os registros têm o mesmo tamanho em bytes; nos
+    demais casos (linhas de tamanhos diferentes, última linha sem quebra,
+    caracteres multibyte) retorna None para que seja usada a leitura linha a linha.
+    
+    Returns:
+        Optional[List[Dict[str, str]]]: Registros, ou None se o arquivo não se encaixa
+    """
+    codec = codecs.lookup(encoding).name
+    if codec not in _SINGLE_BYTE_ENCODINGS and codec != "utf-8":
+        return None
+    
+    fields = [(spec['name'], spec['start'] - 1, spec['length']) for spec in column_specs]
+    names = [name for name, _, _ in fields]
+    if not fields or any(start < 0 or length <= 0 for _, start, length in fields):
+        return None
+    size = os.path.getsize(file_path)
+    if not size or size < _NUMPY_MIN_BYTES:
+        return None
+    
+    buf = np.memmap(file_path, dtype=np.uint8, mode='r')
+    newlines = np.flatnonzero(buf == 10)
+    
+    offset = 0
+    if skip_header:
+        if not len(newlines):
+            return None
+        offset = int(newlines[0]) + 1
+        # O cabeçalho é descartado, mas precisa ser decodificável como na leitura em texto
+        buf[:offset].tobytes().decode(encoding)
+        newlines = newlines[1:]
+    count = len(newlines)
+    if not count:
+        return None
+    
+    # Todos os registros precisam terminar em '\n' a cada record_len bytes
+    record_len = int(newlines[0]) + 1 - offset
+    if offset + count * record_len != len(buf) or not (np.diff(newlines) == record_len).all():
+        return None
+    rows = buf[offset:].reshape(count, record_len)
+    
+    # O NumPy trata '\x00' no fim de uma string '<U' como preenchimento e o descartaria
+    if not rows.all():
+        return None
+    
+    # Aceita '\r\n' em todas as linhas; '\r' isolado também quebra linha em modo texto
+    crlf = record_len > 1 and rows[0, -2] == 13
+    carriage_returns = np.count_nonzero(rows == 13)
+    if crlf:
+        if carriage_returns != count or not (rows[:, -2] == 13).all():
+            return None
+    elif carriage_returns:
+        return None
+    content_len = record_len - (2 if crlf else 1)
+    
+    if codec == "utf-8":
+        # Em UTF-8 a posição em bytes só coincide com a de caracteres se o conteúdo for ASCII
+        if rows.max() >= 0x80:
+            return None
+        codepoints, valid, whitespace = _byte_tables("iso8859-1")
+    else:
+        codepoints, valid, whitespace = _byte_tables(codec)
+        # Bytes indefinidos na codificação: a leitura linha a linha gera o erro
+        if not valid[rows].all():
+            return None
+    
+    # Linhas em branco são ignoradas, como na leitura linha a linha
+    if content_len:
+        candidates = np.flatnonzero(whitespace[rows[:, 0]])
+        if len(candidates):
+            blank = whitespace[rows[candidates, :content_len]].all(axis=1)
+            if blank.any():
+                rows = np.delete(rows, candidates[blank], axis=0)
+    else:
+        return []
+    
+    # Cada coluna vira uma matriz de códigos Unicode vista como array de strings;
+    # em modo texto a linha inclui o '\n', e colunas além dela ficam vazias
+    line_len = content_len + 1
+    empty = [''] * len(rows)
+    # np.strings (NumPy 2) remove os espaços da coluna inteira em uma única ufunc;
+    # np.char é a interface legada, usada em versões anteriores
+    strip = getattr(np, 'strings', np.char).strip
+    columns = []
+    for name, start, length in fields:
+        if start + length > line_len:
+            columns.append(empty)
+            continue
+        chars = codepoints[rows[:, start:start + length]]
+        columns.append(strip(chars.view('<U%d' % length)[:, 0]).tolist())
+    return [dict(zip(names, values)) for values in zip(*columns)]
+
 def read_fixed_width_file(file_path: str, column_specs: List[Dict[str, Any]], 
                          encoding: str = 'utf-8', skip_header: bool = False) -> List[Dict[str, str]]:
     """
@@ -92,35 +468,63 @@ def read_fixed_width_file(file_path: str, column_specs: List[Dict[str, Any]],
         List[Dict[str, str]]: Lista de registros como dicionários
     """
     try:
+        # Arquivos com registros de tamanho uniforme são lidos de forma vetorizada
+        if np is not None:
+            results = _read_fixed_width_numpy(file_path, column_specs, encoding, skip_header)
+            if results is not None:
+                return results
+        
+        # (início base 0, fim, nome) de cada coluna, calculados uma única vez
+        slices = [
+            (spec['start'] - 1, spec['start'] - 1 + spec['length'], spec['name'])
+            for spec in column_specs
+        ]
         results = []
         
-        with open(file_path, 'r', encoding=encoding) as file:
+        # Abre o descritor diretamente e monta a pilha de texto sobre ele; o buffer
+        # de 1MB reduz as chamadas read() de sistema em arquivos grandes
+        raw = os.fdopen(os.open(file_path, os.O_RDONLY | _O_BINARY), 'rb', buffering=_BUFFER_SIZE)
+        try:
+            file = io.TextIOWrapper(raw, encoding=encoding)
+        except BaseException:
+            raw.close()
+            raise
+        
+        with file:
+            # Leitura linear: prefetch agressivo; ao final as páginas são liberadas do cache
+            _fadvise(file.fileno(), 'POSIX_FADV_SEQUENTIAL')
             if skip_header:
                 next(file)
                 
-            for line_number, line in enumerate(file, start=1):
+            for line in file:
                 if not line.strip():
                     continue
-                    
-                record = {}
-                for spec in column_specs:
-                    start = spec['start'] - 1  # Ajustar para índice base 0
-                    end = start + spec['length']
-                    
-                    # Verifica se a linha é longa o suficiente
-                    if len(line) >= end:
-                        value = line[start:end].strip()
-                        record[spec['name']] = value
-                    else:
-                        # Se a linha for mais curta que o esperado
-                        record[spec['name']] = ''
-                        
-                results.append(record)
+                
+                # Colunas além do fim de uma linha mais curta ficam vazias
+                line_len = len(line)
+                results.append({
+                    name: line[start:end].strip() if line_len >= end else ''
+                    for start, end, name in slices
+                })
+            
+            _fadvise(file.fileno(), 'POSIX_FADV_DONTNEED')
                 
         return results
     except Exception as e:
         raise FileProcessingError(f"Erro ao processar arquivo de largura fixa {file_path}: {str(e)}")
 
+# Linhas acumuladas antes de cada escrita em write_fixed_width_file
+_WRITE_BATCH_LINES = 1024
+
+def _values_getter(names: List[str]) -> Callable[[Dict[str, Any]], tuple]:
+    """Retorna uma função que extrai de um registro a tupla de valores das colunas."""
+    if len(names) > 1:
+        return itemgetter(*names)
+    if names:
+        name = names[0]
+        return lambda record: (record[name],)
+    return lambda record: ()
+
 def write_fixed_width_file(data: List[Dict[str, Any]], file_path: str, 
                           column_specs: List[Dict[str, Any]], encoding: str = 'utf-8',
                           include_header: bool = False) -> str:
@@ -138,28 +542,42 @@ def write_fixed_width_file(data: List[Dict[str, Any]], file_path: str,
         str: Caminho do arquivo salvo
     """
     try:
-        with open(file_path, 'w', encoding=encoding, newline='') as file:
+        # Modelo da linha: '%-N.Ns' completa com espaços e trunca em N caracteres
+        template = ''.join('%%-%d.%ds' % (spec['length'], spec['length']) for spec in column_specs) + '\n'
+        names = [spec['name'] for spec in column_specs]
+        values = _values_getter(names)
+        defaults = dict.fromkeys(names, "")
+        
+        with open(file_path, 'w', encoding=encoding, newline='', buffering=_BUFFER_SIZE) as file:
             # Escreve cabeçalho se necessário
             if include_header:
-                header_line = ""
-                for spec in column_specs:
-                    header_name = spec.get('header', spec['name'])
-                    header_line += header_name.ljust(spec['length'])[:spec['length']]
-                file.write(header_line + '\n')
+                file.write(template % tuple(spec.get('header', spec['name']) for spec in column_specs))
             
-            # Escreve os dados
+            # Escreve os dados em blocos de linhas: uma chamada write() por bloco
+            write = file.write
+            batch = []
+            append = batch.append
             for record in data:
-                line = ""
-                for spec in column_specs:
-                    field_name = spec['name']
-                    field_value = str(record.get(field_name, "")).ljust(spec['length'])
-                    line += field_value[:spec['length']]
-                file.write(line + '\n')
+                try:
+                    append(template % values(record))
+                except KeyError:
+                    # Campos ausentes no registro são gravados em branco
+                    append(template % values({**defaults, **record}))
+                if len(batch) >= _WRITE_BATCH_LINES:
+                    write(''.join(batch))
+                    batch.clear()
+            if batch:
+                write(''.join(batch))
                 
         return file_path
     except Exception as e:
         raise FileProcessingError(f"Erro ao escrever arquivo de largura fixa {file_path}: {str(e)}")
 
+@lru_cache(maxsize=64)
+def _normalized_extensions(extensions: Tuple[str, ...]) -> FrozenSet[str]:
+    """Conjunto das extensões permitidas em minúsculas, memorizado por lista de extensões."""
+    return frozenset(e.lower() for e in extensions)
+
 def is_valid_file_extension(file_path: str, allowed_extensions: List[str]) -> bool:
     """
     Verifica se a extensão do arquivo é válida.
@@ -172,45 +590,139 @@ def is_valid_file_extension(file_path: str, allowed_extensions: List[str]) -> bo
         bool: True se a extensão for válida
     """
     _, ext = os.path.splitext(file_path)
-    return ext.lower()[1:] in [e.lower() for e in allowed_extensions]
+    return ext[1:].lower() in _normalized_extensions(tuple(allowed_extensions))
 
-def get_file_size(file_path: str) -> int:
+def get_file_size(file_path: Union[str, os.DirEntry, os.stat_result]) -> int:
     """
     Retorna o tamanho do arquivo em bytes.
     
+    Aceita também uma entrada do os.scandir, cujo stat fica em cache na própria
+    entrada, ou um os.stat_result já obtido, evitando um novo stat por arquivo.
+    
     Args:
-        file_path: Caminho do arquivo
+        file_path: Caminho do arquivo, os.DirEntry ou os.stat_result
         
     Returns:
         int: Tamanho do arquivo em bytes
     """
     try:
+        if isinstance(file_path, os.stat_result):
+            return file_path.st_size
+        if isinstance(file_path, os.DirEntry):
+            return file_path.stat().st_size
         return os.path.getsize(file_path)
     except Exception as e:
         raise FileProcessingError(f"Erro ao obter tamanho do arquivo {file_path}: {str(e)}")
 
-def read_csv_file(file_path: str, delimiter: str = ',', encoding: str = 'utf-8') -> List[Dict[str, str]]:
+def get_file_hash(file_path: str) -> bytes:
     """
-    Lê um arquivo CSV e retorna os dados como lista de dicionários.
+    Calcula o SHA-256 do arquivo.
+    
+    Args:
+        file_path: Caminho do arquivo
+        
+    Returns:
+        bytes: Digest bruto de 32 bytes (formato de Documento.arquivo_hash)
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            if hasattr(hashlib, "file_digest"):
+                return hashlib.file_digest(f, "sha256").digest()
+            digest = hashlib.sha256()
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+            return digest.digest()
+    except Exception as e:
+        raise FileProcessingError(f"Erro ao calcular hash do arquivo {file_path}: {str(e)}")
+
+def _read_csv_arrow(file_path: str, delimiter: str, encoding: str, header: List[str]) -> List[Dict[str, str]]:
+    """Lê o CSV com o leitor em C++ do pyarrow, mantendo todas as colunas como texto."""
+    table = pa_csv.read_csv(
+        file_path,
+        read_options=pa_csv.ReadOptions(
+            encoding=encoding,
+            block_size=_BUFFER_SIZE,
+            column_names=header,
+            skip_rows=1
+        ),
+        parse_options=pa_csv.ParseOptions(delimiter=delimiter, newlines_in_values=True),
+        convert_options=pa_csv.ConvertOptions(column_types={name: pa.string() for name in header})
+    )
+    return table.to_pylist()
+
+def _csv_records(reader, header: List[str]):
+    """Converte as linhas de um csv.reader em dicionários, como faz o csv.DictReader."""
+    width = len(header)
+    for row in reader:
+        # Linhas vazias são ignoradas
+        if not row:
+            continue
+        record = dict(zip(header, row))
+        if len(row) != width:
+            # Colunas faltantes ficam None; as excedentes vão para a chave None
+            if len(row) < width:
+                for key in header[len(row):]:
+                    record[key] = None
+            else:
+                record[None] = row[width:]
+        yield record
+
+def read_csv_file_iter(file_path: str, delimiter: str = ',', encoding: str = 'utf-8') -> Iterator[Dict[str, str]]:
+    """
+    Lê um arquivo CSV registro a registro, sem carregar o arquivo inteiro em memória.
+    
+    O arquivo permanece aberto até que o gerador seja consumido por completo
+    ou encerrado com close().
     
     Args:
         file_path: Caminho para o arquivo CSV
         delimiter: Caractere delimitador
         encoding: Codificação do arquivo
         
-    Returns:
-        List[Dict[str, str]]: Lista de registros como dicionários
+    Yields:
+        Dict[str, str]: Cada registro como dicionário
     """
     try:
-        results = []
         with open(file_path, 'r', encoding=encoding, newline='') as csv_file:
-            reader = csv.DictReader(csv_file, delimiter=delimiter)
-            for row in reader:
-                results.append(dict(row))
-        return results
+            _fadvise(csv_file.fileno(), 'POSIX_FADV_SEQUENTIAL')
+            reader = csv.reader(csv_file, delimiter=delimiter)
+            header = next(reader, None)
+            if header is None:
+                return
+            yield from _csv_records(reader, header)
+            _fadvise(csv_file.fileno(), 'POSIX_FADV_DONTNEED')
     except Exception as e:
         raise FileProcessingError(f"Erro ao ler arquivo CSV {file_path}: {str(e)}")
 
+def read_csv_file(file_path: str, delimiter: str = ',', encoding: str = 'utf-8') -> List[Dict[str, str]]:
+    """
+    Lê um arquivo CSV e retorna os dados como lista de dicionários.
+    
+    Para arquivos grandes percorridos uma única vez, prefira read_csv_file_iter.
+    
+    Args:
+        file_path: Caminho para o arquivo CSV
+        delimiter: Caractere delimitador
+        encoding: Codificação do arquivo
+        
+    Returns:
+        List[Dict[str, str]]: Lista de registros como dicionários
+    """
+    if pa_csv is not None:
+        try:
+            # O cabeçalho vem do módulo csv, com os mesmos nomes do DictReader
+            with open(file_path, 'r', encoding=encoding, newline='') as csv_file:
+                header = next(csv.reader(csv_file, delimiter=delimiter), None)
+            if header:
+                return _read_csv_arrow(file_path, delimiter, encoding, header)
+        except pa.ArrowInvalid:
+            # Ex.: linhas com número irregular de colunas; segue pelo módulo csv
+            pass
+        except Exception as e:
+            raise FileProcessingError(f"Erro ao ler arquivo CSV {file_path}: {str(e)}")
+    
+    return list(read_csv_file_iter(file_path, delimiter, encoding))
+
 def ensure_directory(directory_path: str) -> str:
     """
     Garante que um diretório exista, criando-o se necessário.
@@ -227,28 +739,35 @@ def ensure_directory(directory_path: str) -> str:
     except Exception as e:
         raise FileProcessingError(f"Erro ao criar diretório {directory_path}: {str(e)}")
 
-def list_files(directory_path: str, file_extension: Optional[str] = None) -> List[str]:
+def list_files(directory_path: str, file_extension: Optional[str] = None,
+               with_size: bool = False) -> Union[List[str], List[Tuple[str, int]]]:
     """
     Lista arquivos em um diretório, opcionalmente filtrando por extensão.
     
     Args:
         directory_path: Caminho do diretório
         file_extension: Extensão para filtrar (opcional)
+        with_size: Se True, retorna tuplas (caminho, tamanho em bytes), com um único stat por arquivo
         
     Returns:
-        List[str]: Lista de caminhos de arquivos
+        Union[List[str], List[Tuple[str, int]]]: Lista de caminhos de arquivos, ou de tuplas (caminho, tamanho)
     """
     try:
-        if not os.path.exists(directory_path):
-            return []
-            
-        files = [os.path.join(directory_path, f) for f in os.listdir(directory_path) 
-                if os.path.isfile(os.path.join(directory_path, f))]
-                
+        ext = None
         if file_extension:
             ext = file_extension if file_extension.startswith('.') else f'.{file_extension}'
-            files = [f for f in files if f.lower().endswith(ext.lower())]
-            
-        return files
+            ext = ext.lower()
+        
+        # scandir traz o tipo de cada entrada junto com a listagem, sem um stat por arquivo
+        with os.scandir(directory_path) as entries:
+            files = [
+                entry for entry in entries
+                if entry.is_file() and (ext is None or entry.name.lower().endswith(ext))
+            ]
+        if with_size:
+            return [(entry.path, entry.stat().st_size) for entry in files]
+        return [entry.path for entry in files]
+    except FileNotFoundError:
+        return []
     except Exception as e:
         raise FileProcessingError(f"Erro ao listar arquivos no diretório {directory_path}: {str(e)}") 
\ No newline at end of file